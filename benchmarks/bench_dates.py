@@ -0,0 +1,103 @@
+"""
+bench_dates.py
+
+Compares date parsing in sportscraper.dates with the per-call regex and
+strptime approach it replaced
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_dates.py [rows]
+
+"""
+
+import datetime
+import random
+import re
+import sys
+import timeit
+
+from sportscraper import dates
+
+
+def legacy_format_type(datestr):
+    """
+    format_type before precompiled dispatch
+
+    """
+    val = None
+    if re.match(r"\d{1,2}_\d{1,2}_\d{4}", datestr):
+        val = dates.site_format("fl")
+    elif re.match(r"\d{4}-\d{2}-\d{2}", datestr):
+        val = dates.site_format("nfl")
+    elif re.match(r"\d{1,2}-\d{1,2}-\d{4}", datestr):
+        val = dates.site_format("std")
+    elif re.match(r"\d{1,2}/\d{1,2}/\d{4}", datestr):
+        val = dates.site_format("odd")
+    elif re.match(r"\d{8}", datestr):
+        val = dates.site_format("db")
+    elif re.match(r"\w+ \d+, \d+", datestr):
+        val = dates.site_format("bdy")
+    return val
+
+
+def legacy_strtodate(dstr):
+    """
+    strtodate before precompiled dispatch
+
+    """
+    return datetime.datetime.strptime(dstr, legacy_format_type(dstr))
+
+
+def corpus(rows, days=365):
+    """
+    Mixed-format datestrings, like a season of contest rows
+
+    Args:
+        rows(int):
+        days(int): distinct dates
+
+    Returns:
+        list: of str
+
+    """
+    start = datetime.datetime(2018, 9, 1)
+    formats = [dates.site_format(site) for site in ("fl", "nfl", "std", "odd", "db")]
+    rng = random.Random(0)
+    return [
+        (start + datetime.timedelta(days=rng.randrange(days))).strftime(
+            rng.choice(formats)
+        )
+        for _ in range(rows)
+    ]
+
+
+def main(rows=100000):
+    datestrs = corpus(rows)
+    cases = [
+        ("legacy strtodate", lambda: [legacy_strtodate(d) for d in datestrs]),
+        ("strtodate", lambda: [dates.strtodate(d) for d in datestrs]),
+        ("parse_dates", lambda: dates.parse_dates(datestrs)),
+        ("legacy format_type", lambda: [legacy_format_type(d) for d in datestrs]),
+        ("format_type", lambda: [dates.format_type(d) for d in datestrs]),
+    ]
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        parsed = dates.parse_dates(datestrs)
+        days = np.array(parsed, dtype="datetime64[D]")
+        flstrs = dates.datetostr64(days, "fl")
+        cases += [
+            ("strtodate64 mixed", lambda: dates.strtodate64(datestrs)),
+            ("strtodate64 fl", lambda: dates.strtodate64(flstrs, "fl")),
+            ("datetostr fl", lambda: [dates.datetostr(d, "fl") for d in parsed]),
+            ("datetostr64 fl", lambda: dates.datetostr64(days, "fl")),
+        ]
+    print(f"{rows} rows")
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+        print(f"{name:<20} {seconds:8.3f} s  {rows / seconds:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,188 @@
+"""
+bench_draft.py
+
+Compares draft.Parser.draft_picks_many, as dicts and as columns, with the
+per-draft parsing it replaced, on a synthetic corpus of drafts sharing a few
+player pools
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_draft.py [drafts]
+
+"""
+
+import logging
+import random
+import sys
+import timeit
+
+from sportscraper.draft import Parser
+from sportscraper.utility import merge_two
+
+
+def legacy_draft_picks(parser, draft):
+    """
+    draft_picks before PoolIndex, rebuilds every lookup per draft
+
+    """
+    picks = []
+    if draft.get("draft"):
+        draft = draft["draft"]
+    teams, teamsd = parser._teams(draft["teams"])
+    posd = {int(pos["id"]): pos["name"] for pos in draft["positions"]}
+    players = []
+    for p in parser._combine_bookings_players(draft["bookings"], draft["players"]):
+        tid = p.get("team_id")
+        p["team_abbr"] = teamsd.get(tid, "FA") if tid else "FA"
+        p["position"] = posd.get(p["position_id"])
+        players.append(p)
+    player_bookings_d = {p["booking_id"]: p for p in players}
+    pkwanted = [
+        "booking_id",
+        "id",
+        "draft_roster_id",
+        "pick_number",
+        "slot_id",
+        "source",
+    ]
+    for t in draft["draft_rosters"]:
+        for pick in [
+            {k: v for k, v in pk.items() if k in pkwanted} for pk in t["picks"]
+        ]:
+            pick["user_id"] = t["user_id"]
+            pick["league_id"] = draft["id"]
+            match = player_bookings_d.get(pick["booking_id"])
+            if match:
+                picks.append(merge_two(pick, match))
+    return picks
+
+
+def player_pool(time_window_id, size=250):
+    """
+    Bookings, players, teams and positions for one time window
+
+    Args:
+        time_window_id(int):
+        size(int): players in pool
+
+    Returns:
+        dict
+
+    """
+    rng = random.Random(time_window_id)
+    base = time_window_id * 10000
+    return {
+        "time_window_id": time_window_id,
+        "teams": [
+            {"id": i, "abbr": f"T{i}", "city": "City", "nickname": "Team"}
+            for i in range(1, 33)
+        ],
+        "positions": [
+            {"id": str(i), "name": name}
+            for i, name in enumerate(["QB", "RB", "WR", "TE"], 1)
+        ],
+        "bookings": [
+            {
+                "id": base + i,
+                "player_id": base + i,
+                "adp": str(round(rng.uniform(1, 250), 1)),
+                "position_id": rng.randint(1, 4),
+                "projected_points": str(round(rng.uniform(0, 300), 1)),
+                "status": "active",
+                "time_window_id": time_window_id,
+            }
+            for i in range(size)
+        ],
+        "players": [
+            {
+                "id": base + i,
+                "first_name": "First",
+                "last_name": f"Last{i}",
+                "team_id": rng.randint(0, 32),
+                "injury_status": None,
+                "sportradar_id": f"sr-{base + i}",
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def corpus(drafts, pools=4, teams=12, rounds=18, snapshots=3):
+    """
+    Drafts from a few time windows, like a season of best-ball leagues
+
+    Args:
+        drafts(int):
+        pools(int): distinct time windows
+        teams(int): rosters per draft
+        rounds(int): picks per roster
+        snapshots(int): adp snapshots per time window, adp moves between drafts
+
+    Returns:
+        list: of dict
+
+    """
+    rng = random.Random(0)
+    pool_list = [player_pool(time_window_id) for time_window_id in range(1, pools + 1)]
+    bookings = [
+        [
+            [dict(b, adp=str(round(float(b["adp"]) + i, 1))) for b in pool["bookings"]]
+            for i in range(snapshots)
+        ]
+        for pool in pool_list
+    ]
+    content = []
+    for league_id in range(drafts):
+        pool = pool_list[league_id % pools]
+        snapshot = bookings[league_id % pools][league_id // pools % snapshots]
+        booking_ids = rng.sample([b["id"] for b in pool["bookings"]], teams * rounds)
+        rosters = []
+        for team in range(teams):
+            rosters.append(
+                {
+                    "id": league_id * 100 + team,
+                    "user_id": rng.randrange(50000),
+                    "pick_order": team + 1,
+                    "picks": [
+                        {
+                            "id": league_id * 1000 + team * rounds + rd,
+                            "booking_id": booking_ids[team * rounds + rd],
+                            "draft_roster_id": league_id * 100 + team,
+                            "pick_number": rd * teams + team + 1,
+                            "slot_id": rd,
+                            "source": "user",
+                            "created_at": "2019-08-01T10:00:00Z",
+                        }
+                        for rd in range(rounds)
+                    ],
+                }
+            )
+        content.append(
+            dict(pool, id=league_id, bookings=snapshot, draft_rosters=rosters)
+        )
+    return content
+
+
+def main(drafts=10000):
+    logging.disable(logging.INFO)
+    content = corpus(drafts)
+    picks = sum(len(t["picks"]) for d in content for t in d["draft_rosters"])
+    cases = [
+        (
+            "legacy draft_picks",
+            lambda: [legacy_draft_picks(Parser(), d) for d in content],
+        ),
+        ("draft_picks no reuse", lambda: [Parser().draft_picks(d) for d in content]),
+        ("draft_picks_many", lambda: Parser().draft_picks_many(content)),
+        (
+            "columnar",
+            lambda: Parser().draft_picks_many(content, columnar=True),
+        ),
+    ]
+    print(f"{drafts} drafts, {picks} picks")
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+        print(f"{name:<20} {seconds:8.3f} s  {picks / seconds:12,.0f} picks/s")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
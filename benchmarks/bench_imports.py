@@ -0,0 +1,55 @@
+"""
+bench_imports.py
+
+Times importing sportscraper modules in a fresh interpreter, which stays
+small as long as heavy dependencies are imported lazily
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_imports.py [repeat]
+
+"""
+
+import json
+import subprocess
+import sys
+
+
+MODULES = (
+    "sportscraper",
+    "sportscraper.dates",
+    "sportscraper.draft",
+    "sportscraper.draftkings",
+    "sportscraper.fantasylabs",
+    "sportscraper.yahoo",
+)
+
+
+def import_time(module):
+    """
+    Seconds to import module in fresh interpreter
+
+    Args:
+        module(str): e.g. 'sportscraper.draft'
+
+    Returns:
+        float
+
+    """
+    code = (
+        "import json, time; t = time.perf_counter(); import {}; "
+        "print(json.dumps(time.perf_counter() - t))"
+    ).format(module)
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout)
+
+
+def main(repeat=5):
+    for module in MODULES:
+        seconds = min(import_time(module) for _ in range(repeat))
+        print(f"{module:<26} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,224 @@
+"""
+browserpool.py
+
+Pool of warm browser scrapers leased to callers, so jobs do not pay
+browser startup every time
+
+"""
+
+import contextlib
+import logging
+import queue
+import threading
+
+from .scraper import BrowserScraper
+
+
+class BrowserPool:
+    """
+    Keeps up to size browsers running and leases them one caller at a time.
+    Browsers are recycled after max_pages pages or when their memory grows
+    past max_memory.
+
+    Usage:
+        pool = BrowserPool(size=4, profile=os.getenv('FIREFOX_PROFILE'))
+        with pool.lease() as browser:
+            content = browser.get(url)
+
+        pool = BrowserPool(size=2, scraper_class=fantasylabs.BScraper, profile=None)
+        with pool.lease() as browser:
+            model = browser.model('nba')
+
+    """
+
+    def __init__(
+        self,
+        size=2,
+        max_pages=200,
+        max_memory=1024 * 1024 * 1024,
+        scraper_class=BrowserScraper,
+        warm=True,
+        **kwargs,
+    ):
+        """
+        Creates pool
+
+        Args:
+            size(int): maximum browsers running at once, default 2
+            max_pages(int): pages loaded before browser is recycled, default 200
+            max_memory(int): bytes of browser memory before recycling, default 1 GB
+            scraper_class(type): BrowserScraper or subclass
+            warm(bool): launch all browsers now rather than on first lease
+            **kwargs: passed to scraper_class, e.g. profile, visible
+
+        """
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.size = size
+        self.max_pages = max_pages
+        self.max_memory = max_memory
+        self.scraper_class = scraper_class
+        self.kwargs = kwargs
+        self.started = 0
+        self.recycled = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+        if warm:
+            for _ in range(size):
+                self._idle.put(self._start(launch=True))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._idle.qsize()
+
+    def _start(self, launch=False):
+        """
+        Starts new browser
+
+        Args:
+            launch(bool): launch browser now, scrapers otherwise launch it
+                on first cache miss
+
+        Returns:
+            BrowserScraper
+
+        """
+        with self._lock:
+            self.started += 1
+        logging.info("starting browser %s", self.started)
+        scraper = self.scraper_class(**self.kwargs)
+        if launch:
+            try:
+                scraper.launch()
+            except BaseException:
+                self._stop(scraper)
+                raise
+        return scraper
+
+    def _stop(self, scraper):
+        """
+        Closes browser, logging rather than raising errors
+
+        Args:
+            scraper(BrowserScraper):
+
+        Returns:
+            None
+
+        """
+        try:
+            scraper.close()
+        except Exception as err:
+            logging.warning("could not close browser: %s", err)
+
+    def expired(self, scraper):
+        """
+        Tests if browser should be recycled
+
+        Args:
+            scraper(BrowserScraper):
+
+        Returns:
+            bool
+
+        """
+        if self.max_pages and scraper.pages >= self.max_pages:
+            return True
+        return bool(self.max_memory) and scraper.memory() >= self.max_memory
+
+    def acquire(self, timeout=None):
+        """
+        Takes idle browser, starting one if pool is below size
+
+        Args:
+            timeout(float): seconds to wait for a free browser, None waits forever
+
+        Returns:
+            BrowserScraper
+
+        """
+        if self._closed:
+            raise RuntimeError("pool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"no browser free after {timeout} s")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._start()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, scraper, discard=False):
+        """
+        Returns browser to pool, recycling it if expired
+
+        Args:
+            scraper(BrowserScraper): from acquire
+            discard(bool): close browser even if not expired, e.g. after an error
+
+        Returns:
+            None
+
+        """
+        try:
+            if self._closed:
+                self._stop(scraper)
+            elif discard or self.expired(scraper):
+                logging.info("recycling browser after %s pages", scraper.pages)
+                self._stop(scraper)
+                with self._lock:
+                    self.recycled += 1
+            else:
+                self._idle.put(scraper)
+        finally:
+            self._slots.release()
+
+    @contextlib.contextmanager
+    def lease(self, timeout=None):
+        """
+        Leases browser for the duration of a with block. Browser is discarded
+        if the block raises, since it may be left on an error page.
+
+        Args:
+            timeout(float): seconds to wait for a free browser
+
+        Returns:
+            BrowserScraper
+
+        """
+        scraper = self.acquire(timeout=timeout)
+        try:
+            yield scraper
+        except BaseException:
+            self.release(scraper, discard=True)
+            raise
+        self.release(scraper)
+
+    def close(self):
+        """
+        Closes idle browsers. Leased browsers are closed when released.
+
+        Returns:
+            None
+
+        """
+        self._closed = True
+        while True:
+            try:
+                scraper = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._stop(scraper)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,799 @@
+"""
+cache.py
+
+SQLite-backed HTTP response cache shared by scrapers across processes
+
+"""
+
+from collections import namedtuple
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "sportscraper"
+)
+
+# seconds, overrides expire_hours for hosts whose content changes faster or slower,
+# keys are a host or a host/path prefix, longest match wins
+HOST_TTLS = {
+    "www.draftkings.com": 15 * 60,
+    # draftables change with injuries and late swaps
+    "api.draftkings.com": 15 * 60,
+    "archive.org": 24 * 3600,
+    "web.archive.org": 365 * 24 * 3600,
+    "fantasysports.yahooapis.com": 5 * 60,
+    # DRAFT listings grow as contests finish, drafts and results do not change
+    "api.playdraft.com/feeds/": 3600,
+    "api.playdraft.com/v1/clustered_complete_contests": 15 * 60,
+    "api.playdraft.com/v1/users/": 15 * 60,
+    "api.playdraft.com/v1/window_clusters/": 15 * 60,
+    "api.playdraft.com/v2/window_clusters/": 15 * 60,
+    "api.playdraft.com/v3/window_clusters/": 15 * 60,
+}
+
+# request headers that change the response, so are part of the cache key,
+# authorization keeps responses for different tokens apart
+VARY_HEADERS = ("accept", "authorization", "x-user-auth-id")
+
+# decoded bodies are stored, so these no longer describe them
+_SKIP_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+CachedResponse = namedtuple(
+    "CachedResponse",
+    ["key", "url", "status", "headers", "body", "expires", "etag", "last_modified"],
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    method TEXT,
+    url TEXT,
+    status INTEGER,
+    headers TEXT,
+    digest TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    created REAL,
+    expires REAL,
+    accessed REAL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE TABLE IF NOT EXISTS bodies (
+    digest TEXT PRIMARY KEY,
+    data BLOB,
+    size INTEGER
+);
+"""
+
+
+def cache_path(cache_name=None):
+    """
+    Location of cache database
+
+    Args:
+        cache_name(str): None for default cache, bare name, full path or
+            directory, e.g. one left by cachecontrol
+
+    Returns:
+        str
+
+    """
+    if not cache_name:
+        return os.path.join(DEFAULT_CACHE_DIR, "http.sqlite")
+    if "/" not in cache_name:
+        return os.path.join(DEFAULT_CACHE_DIR, f"{cache_name}.sqlite")
+    if os.path.isdir(cache_name):
+        return os.path.join(cache_name, "http.sqlite")
+    return cache_name
+
+
+def atomic_write(file_name, write):
+    """
+    Writes to temporary file in same directory and renames over file_name,
+    so readers never see a partial file
+
+    Args:
+        file_name(str):
+        write(callable): takes binary file object
+
+    Returns:
+        None
+
+    """
+    dirname = os.path.dirname(file_name)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=dirname or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as outfile:
+            write(outfile)
+        os.replace(tmp_name, file_name)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def normalize_url(url, params=None):
+    """
+    Normalizes url so equivalent requests map to the same cache entry
+
+    Args:
+        url(str):
+        params(dict): url parameters not yet in url
+
+    Returns:
+        str: url with lowercase scheme/host, sorted query and no fragment
+
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend(parse_qsl(urlencode(params, doseq=True), keep_blank_values=True))
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path or "/",
+            urlencode(sorted(query)),
+            "",
+        )
+    )
+
+
+class ResponseCache:
+    """
+    Content-addressed response cache in a single SQLite (WAL) file
+
+    Responses are keyed by method, normalized url and vary headers. Bodies are
+    stored compressed and once per distinct content, so identical payloads from
+    different urls share storage.
+
+    """
+
+    def __init__(
+        self,
+        path=None,
+        expire_hours=168,
+        host_ttls=None,
+        max_size=512 * 1024 * 1024,
+        vary_headers=VARY_HEADERS,
+    ):
+        """
+        Opens or creates cache
+
+        Args:
+            path(str): database file, default is cache_path()
+            expire_hours(int): default time to live, default 168
+            host_ttls(dict): host or host/path prefix: seconds, updates HOST_TTLS
+            max_size(int): compressed bytes kept before least recently used are evicted
+            vary_headers(tuple): lowercase request headers included in key
+
+        """
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.path = path or cache_path()
+        self.expire_hours = expire_hours
+        self.host_ttls = dict(HOST_TTLS)
+        if host_ttls:
+            self.host_ttls.update(host_ttls)
+        self.max_size = max_size
+        self.vary_headers = tuple(h.lower() for h in vary_headers)
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def __len__(self):
+        """
+        Number of cached responses
+
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def key(self, method, url, params=None, headers=None):
+        """
+        Cache key for request
+
+        Args:
+            method(str): 'GET', etc.
+            url(str):
+            params(dict): url parameters not yet in url
+            headers(dict): request headers
+
+        Returns:
+            str
+
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        parts = [method.upper(), normalize_url(url, params)]
+        parts.extend(f"{h}={headers.get(h) or ''}" for h in self.vary_headers)
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def ttl(self, url):
+        """
+        Time to live for url, from longest matching HOST_TTLS entry
+
+        Args:
+            url(str):
+
+        Returns:
+            float: seconds
+
+        """
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        path = host + parts.path
+        ttl = self.host_ttls.get(host, self.expire_hours * 3600)
+        matched = 0
+        for prefix, seconds in self.host_ttls.items():
+            if len(prefix) > matched and "/" in prefix and path.startswith(prefix):
+                ttl = seconds
+                matched = len(prefix)
+        return ttl
+
+    def get(self, key):
+        """
+        Gets cached response, fresh or stale
+
+        Args:
+            key(str):
+
+        Returns:
+            CachedResponse or None
+
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT r.url, r.status, r.headers, b.data, r.expires, r.etag, "
+                "r.last_modified FROM responses r JOIN bodies b "
+                "ON r.digest = b.digest WHERE r.key = ?",
+                (key,),
+            ).fetchone()
+            if not row:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        url, status, headers, data, expires, etag, last_modified = row
+        return CachedResponse(
+            key,
+            url,
+            status,
+            json.loads(headers),
+            zlib.decompress(data),
+            expires,
+            etag,
+            last_modified,
+        )
+
+    @staticmethod
+    def fresh(cached):
+        """
+        Tests if cached response has not expired
+
+        Args:
+            cached(CachedResponse):
+
+        Returns:
+            bool
+
+        """
+        return cached is not None and cached.expires > time.time()
+
+    def set(self, key, method, url, status, headers, body):
+        """
+        Stores response
+
+        Args:
+            key(str): from key()
+            method(str):
+            url(str):
+            status(int): HTTP status code
+            headers(dict): response headers
+            body(bytes): decoded response body
+
+        Returns:
+            None
+
+        """
+        headers = {
+            k: v for k, v in dict(headers).items() if k.lower() not in _SKIP_HEADERS
+        }
+        lower = {k.lower(): v for k, v in headers.items()}
+        digest = hashlib.sha256(body).hexdigest()
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM bodies WHERE digest = ?", (digest,)
+            ).fetchone()
+            if not exists:
+                data = zlib.compress(body)
+                self._conn.execute(
+                    "INSERT INTO bodies (digest, data, size) VALUES (?, ?, ?)",
+                    (digest, data, len(data)),
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, method, url, status, headers, "
+                "digest, etag, last_modified, created, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    method.upper(),
+                    url,
+                    status,
+                    json.dumps(headers),
+                    digest,
+                    lower.get("etag"),
+                    lower.get("last-modified"),
+                    now,
+                    now + self.ttl(url),
+                    now,
+                ),
+            )
+            self._writes += 1
+        if self._writes % 100 == 0:
+            self.evict()
+
+    def refresh(self, key, url):
+        """
+        Extends expiry after successful revalidation
+
+        Args:
+            key(str):
+            url(str):
+
+        Returns:
+            None
+
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires = ?, accessed = ? WHERE key = ?",
+                (now + self.ttl(url), now, key),
+            )
+
+    def expire(self, key):
+        """
+        Marks response stale, so next request revalidates it with the server
+
+        Args:
+            key(str):
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            self._conn.execute("UPDATE responses SET expires = 0 WHERE key = ?", (key,))
+
+    def delete(self, key):
+        """
+        Removes one response
+
+        Args:
+            key(str):
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._delete_orphans()
+
+    def clear(self):
+        """
+        Removes all responses
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM bodies")
+
+    def size(self):
+        """
+        Total compressed size of stored bodies
+
+        Returns:
+            int: bytes
+
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM bodies"
+            ).fetchone()[0]
+
+    def evict(self, max_size=None):
+        """
+        Removes least recently used responses until cache fits in max_size
+
+        Args:
+            max_size(int): bytes, default self.max_size
+
+        Returns:
+            int: number of responses removed
+
+        """
+        max_size = self.max_size if max_size is None else max_size
+        removed = 0
+        total = self.size()
+        if total <= max_size:
+            return removed
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM responses ORDER BY accessed"
+            ).fetchall()
+            for (key,) in rows:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                removed += 1
+                total -= self._delete_orphans()
+                if total <= max_size:
+                    break
+        logging.info("evicted %s responses from %s", removed, self.path)
+        return removed
+
+    def _delete_orphans(self):
+        """
+        Removes bodies no longer referenced by any response. Caller holds lock.
+
+        Returns:
+            int: bytes freed
+
+        """
+        freed = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM bodies WHERE digest NOT IN "
+            "(SELECT digest FROM responses)"
+        ).fetchone()[0]
+        if freed:
+            self._conn.execute(
+                "DELETE FROM bodies WHERE digest NOT IN (SELECT digest FROM responses)"
+            )
+        return freed
+
+    def close(self):
+        """
+        Closes database connection
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            self._conn.close()
+
+
+class FileCache:
+    """
+    On-disk cache of gzipped response bodies, helpful for debugging because can
+    look at files. Files are sharded by key as <cache_dir>/ab/cd/<key>.gz with
+    a <key>.json metadata file holding url and expiry.
+
+    """
+
+    def __init__(self, cache_dir=None, expire_hours=168):
+        """
+        Creates file cache
+
+        Args:
+            cache_dir(str): default DEFAULT_CACHE_DIR/files
+            expire_hours(int): time to live, default 168
+
+        """
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.cache_dir = cache_dir or os.path.join(DEFAULT_CACHE_DIR, "files")
+        self.expire_hours = expire_hours
+
+    @staticmethod
+    def key(url, params=None):
+        """
+        Cache key for url
+
+        Args:
+            url(str):
+            params(dict): url parameters not yet in url
+
+        Returns:
+            str
+
+        """
+        return hashlib.sha256(normalize_url(url, params).encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        """
+        Location of cached body, metadata is same path with .json suffix
+
+        Args:
+            key(str):
+
+        Returns:
+            str
+
+        """
+        return os.path.join(self.cache_dir, key[0:2], key[2:4], f"{key}.gz")
+
+    def _meta_path(self, key):
+        """
+        Location of metadata file
+
+        """
+        return self.path(key)[:-3] + ".json"
+
+    def metadata(self, key):
+        """
+        Gets metadata for cached body
+
+        Args:
+            key(str):
+
+        Returns:
+            dict or None
+
+        """
+        try:
+            with open(self._meta_path(key), "r") as infile:
+                return json.load(infile)
+        except (OSError, ValueError):
+            return None
+
+    def fresh(self, key):
+        """
+        Tests if cached body exists and has not expired
+
+        Args:
+            key(str):
+
+        Returns:
+            bool
+
+        """
+        meta = self.metadata(key)
+        return bool(meta) and meta["expires"] > time.time()
+
+    def open(self, key, stale=False):
+        """
+        Opens cached body for streaming reads
+
+        Args:
+            key(str):
+            stale(bool): open even if expired, e.g. right after set
+
+        Returns:
+            file: binary file object, or None if missing or expired
+
+        """
+        if not stale and not self.fresh(key):
+            return None
+        try:
+            return gzip.open(self.path(key), "rb")
+        except OSError:
+            return None
+
+    def get(self, key, encoding=None, stale=False):
+        """
+        Gets cached body
+
+        Args:
+            key(str):
+            encoding(str): decode to str, None returns bytes
+            stale(bool): return body even if expired, e.g. right after set
+
+        Returns:
+            bytes or str, None if missing or expired
+
+        """
+        infile = self.open(key, stale=stale)
+        if infile is None:
+            return None
+        with infile:
+            content = infile.read()
+        if encoding:
+            return content.decode(encoding)
+        return content
+
+    def set(self, key, url, chunks, content_type=None):
+        """
+        Stores body without holding it in memory
+
+        Args:
+            key(str):
+            url(str):
+            chunks(iterable): of bytes
+            content_type(str): Content-Type header
+
+        Returns:
+            int: uncompressed bytes written
+
+        """
+        size = 0
+
+        def _write_body(outfile):
+            nonlocal size
+            with gzip.GzipFile(fileobj=outfile, mode="wb") as gz:
+                for chunk in chunks:
+                    if chunk:
+                        gz.write(chunk)
+                        size += len(chunk)
+
+        def _write_meta(outfile):
+            now = time.time()
+            meta = {
+                "url": url,
+                "content_type": content_type,
+                "size": size,
+                "created": now,
+                "expires": now + self.expire_hours * 3600,
+            }
+            outfile.write(json.dumps(meta).encode("utf-8"))
+
+        # body first, so metadata never points at a partial body
+        atomic_write(self.path(key), _write_body)
+        atomic_write(self._meta_path(key), _write_meta)
+        return size
+
+    def expire(self):
+        """
+        Removes expired bodies and metadata
+
+        Returns:
+            int: number of entries removed
+
+        """
+        removed = 0
+        now = time.time()
+        for dirpath, _, file_names in os.walk(self.cache_dir):
+            for file_name in file_names:
+                if not file_name.endswith(".json"):
+                    continue
+                key = file_name[:-5]
+                meta = self.metadata(key)
+                if meta and meta["expires"] > now:
+                    continue
+                for path in (self.path(key), self._meta_path(key)):
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                removed += 1
+        return removed
+
+    def clear(self):
+        """
+        Removes all cached files
+
+        Returns:
+            None
+
+        """
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+class CacheAdapter:
+    """
+    Transport adapter for requests.Session that serves GET requests from
+    ResponseCache and revalidates stale entries with ETag / Last-Modified
+
+    """
+
+    def __init__(self, cache, adapter=None):
+        """
+        Wraps transport adapter
+
+        Args:
+            cache(ResponseCache):
+            adapter(BaseAdapter): adapter that does network i/o, default HTTPAdapter
+
+        """
+        if adapter is None:
+            from requests.adapters import HTTPAdapter
+
+            adapter = HTTPAdapter()
+        self.cache = cache
+        self.adapter = adapter
+
+    def _build_response(self, request, cached):
+        """
+        Creates requests Response from cached response
+
+        Args:
+            request(PreparedRequest):
+            cached(CachedResponse):
+
+        Returns:
+            Response
+
+        """
+        from requests.models import Response
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+
+        resp = Response()
+        resp.status_code = cached.status
+        resp.reason = "OK"
+        resp.headers = CaseInsensitiveDict(cached.headers)
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.raw = io.BytesIO(cached.body)
+        resp._content = cached.body
+        resp._content_consumed = True
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        resp.from_cache = True
+        resp.revalidated = False
+        return resp
+
+    def send(self, request, stream=False, **kwargs):
+        """
+        Sends PreparedRequest, using cache when possible
+
+        Args:
+            request(PreparedRequest):
+            stream(bool): do not read body, streamed responses are not stored
+            **kwargs: passed to wrapped adapter
+
+        Returns:
+            Response
+
+        """
+        if request.method not in ("GET", "HEAD"):
+            return self.adapter.send(request, stream=stream, **kwargs)
+
+        key = self.cache.key(request.method, request.url, headers=request.headers)
+        cached = self.cache.get(key)
+        if self.cache.fresh(cached):
+            return self._build_response(request, cached)
+
+        if cached and cached.etag:
+            request.headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            request.headers["If-Modified-Since"] = cached.last_modified
+        resp = self.adapter.send(request, stream=stream, **kwargs)
+
+        if resp.status_code == 304 and cached:
+            resp.close()
+            self.cache.refresh(key, request.url)
+            resp = self._build_response(request, cached)
+            resp.revalidated = True
+            return resp
+
+        resp.from_cache = False
+        # streaming callers store bodies themselves, e.g. in FileCache
+        if resp.status_code == 200 and request.method == "GET" and not stream:
+            cache_control = resp.headers.get("Cache-Control", "")
+            if "no-store" not in cache_control:
+                self.cache.set(key, "GET", request.url, 200, resp.headers, resp.content)
+        return resp
+
+    def close(self):
+        """
+        Closes wrapped adapter
+
+        """
+        self.adapter.close()
+
+
+if __name__ == "__main__":
+    pass
@@ -5,10 +5,94 @@
 """
 
 import datetime
+from functools import lru_cache
 import logging
 import re
 
 
+SITE_FORMATS = {
+    "std": "%m-%d-%Y",
+    "fl": "%m_%d_%Y",
+    "fl2017": "%m-%d-%Y",
+    "fl_matchups": "%-m-%-d-%Y",
+    "nfl": "%Y-%m-%d",
+    "odd": "%m/%d/%Y",
+    "db": "%Y%m%d",
+    "bdy": "%B %d, %Y",
+    "espn_fantasy": "%Y%m%d",
+}
+
+# one pass decides format, first alternative that matches wins
+_FORMAT_RE = re.compile(
+    r"(?P<fl>\d{1,2}_\d{1,2}_\d{4})"
+    r"|(?P<nfl>\d{4}-\d{2}-\d{2})"
+    r"|(?P<std>\d{1,2}-\d{1,2}-\d{4})"
+    r"|(?P<odd>\d{1,2}/\d{1,2}/\d{4})"
+    r"|(?P<db>\d{8})"
+    r"|(?P<bdy>\w+ \d+, \d+)"
+)
+
+# numeric formats are parsed without strptime
+_FIELDS_RE = {
+    "fl": re.compile(r"(?P<m>\d{1,2})_(?P<d>\d{1,2})_(?P<y>\d{4})"),
+    "nfl": re.compile(r"(?P<y>\d{4})-(?P<m>\d{1,2})-(?P<d>\d{1,2})"),
+    "std": re.compile(r"(?P<m>\d{1,2})-(?P<d>\d{1,2})-(?P<y>\d{4})"),
+    "odd": re.compile(r"(?P<m>\d{1,2})/(?P<d>\d{1,2})/(?P<y>\d{4})"),
+    "db": re.compile(r"(?P<y>\d{4})(?P<m>\d{2})(?P<d>\d{2})"),
+}
+
+# positions in 'YYYY-MM-DD' for zero-padded site formats, str items are literals
+_ISO_LAYOUTS = {
+    "nfl": (0, 1, 2, 3, "-", 5, 6, "-", 8, 9),
+    "db": (0, 1, 2, 3, 5, 6, 8, 9),
+    "espn_fantasy": (0, 1, 2, 3, 5, 6, 8, 9),
+    "std": (5, 6, "-", 8, 9, "-", 0, 1, 2, 3),
+    "fl2017": (5, 6, "-", 8, 9, "-", 0, 1, 2, 3),
+    "fl": (5, 6, "_", 8, 9, "_", 0, 1, 2, 3),
+    "odd": (5, 6, "/", 8, 9, "/", 0, 1, 2, 3),
+}
+
+
+@lru_cache(maxsize=4096)
+def _site_key(datestr):
+    """
+    Key of SITE_FORMATS that datestr is in
+
+    Args:
+        datestr(str):
+
+    Returns:
+        str or None
+
+    """
+    match = _FORMAT_RE.match(datestr)
+    return match.lastgroup if match else None
+
+
+def _parse(datestr):
+    """
+    Parses datestring, using regex fields rather than strptime where possible
+
+    Args:
+        datestr(str):
+
+    Returns:
+        datetime.datetime
+
+    """
+    key = _site_key(datestr)
+    if not key:
+        raise ValueError(f"unknown date format: {datestr}")
+    fields = _FIELDS_RE.get(key)
+    if fields:
+        match = fields.fullmatch(datestr)
+        if match:
+            return datetime.datetime(
+                int(match.group("y")), int(match.group("m")), int(match.group("d"))
+            )
+    return datetime.datetime.strptime(datestr, SITE_FORMATS[key])
+
+
 def convert_format(datestr, site):
     """
     Converts string from one date format to another
@@ -21,12 +105,10 @@ def convert_format(datestr, site):
         str
 
     """
-    fmt = format_type(datestr)
     newfmt = site_format(site)
-    if fmt and newfmt:
+    if newfmt and _site_key(datestr):
         try:
-            dtobj = datetime.datetime.strptime(datestr, fmt)
-            return datetime.datetime.strftime(dtobj, newfmt)
+            return datetime.datetime.strftime(_parse(datestr), newfmt)
         except BaseException:
             return None
     else:
@@ -63,6 +145,63 @@ def date_list(date1, date2):
     return [date1 - datetime.timedelta(days=x) for x in range(0, season.days + 1)]
 
 
+def _day64(value):
+    """
+    Converts date to numpy datetime64[D]
+
+    Args:
+        value: datestring, date, datetime or datetime64
+
+    Returns:
+        numpy.datetime64
+
+    """
+    import numpy as np
+
+    if isinstance(value, str):
+        value = strtodate(value)
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return np.datetime64(value, "D")
+
+
+def _chars(values, width):
+    """
+    Views array of str as 2-d array of single characters
+
+    Args:
+        values(numpy.ndarray): 1-d array of str
+        width(int): characters per value
+
+    Returns:
+        numpy.ndarray: shape (len(values), width), dtype U1
+
+    """
+    import numpy as np
+
+    values = np.ascontiguousarray(values, dtype=f"U{width}")
+    return values.view("U1").reshape(-1, width)
+
+
+def date_list64(date1, date2):
+    """
+    Same days as date_list, as numpy array
+
+    Args:
+        date1: more recent datetime object or string
+        date2: less recent datetime object or string
+
+    Returns:
+        numpy.ndarray: of datetime64[D], most recent first
+
+    """
+    import numpy as np
+
+    first = _day64(date1)
+    last = _day64(date2)
+    return first - np.arange((first - last).astype(int) + 1)
+
+
 def datetostr(dtobj, site):
     """
     Converts datetime object to formats used by different sites
@@ -78,6 +217,43 @@ def datetostr(dtobj, site):
     return datetime.datetime.strftime(dtobj, site_format(site))
 
 
+def datetostr64(days, site):
+    """
+    Formats array of dates for a site in one call. Zero-padded numeric formats
+    are assembled from characters of the ISO string; others are formatted once
+    per distinct date.
+
+    Args:
+        days(array-like): of datetime64, date or datetime
+        site(str): 'nfl', 'fl', 'db', 'espn_fantasy', etc.
+
+    Returns:
+        numpy.ndarray: of str, '' where date is NaT
+
+    """
+    import numpy as np
+
+    fmt = site_format(site)
+    if not fmt:
+        raise ValueError("invalid date format")
+    days = np.asarray(days, dtype="datetime64[D]")
+    flat = days.ravel()
+    layout = _ISO_LAYOUTS.get(site)
+    if layout:
+        chars = _chars(np.datetime_as_string(flat, unit="D"), 10)
+        out = np.empty((flat.size, len(layout)), dtype="U1")
+        for col, src in enumerate(layout):
+            out[:, col] = chars[:, src] if isinstance(src, int) else src
+        strs = out.view(f"U{len(layout)}").reshape(days.shape)
+    else:
+        uniq, inverse = np.unique(flat, return_inverse=True)
+        formatted = np.array(
+            [day.strftime(fmt) if day else "" for day in uniq.tolist()], dtype=str
+        )
+        strs = formatted[inverse].reshape(days.shape)
+    return np.where(np.isnat(days), "", strs)
+
+
 def format_type(datestr):
     """
     Uses regular expressions to determine format of datestring
@@ -89,20 +265,90 @@ def format_type(datestr):
         fmt (str): format string for date
 
     """
-    val = None
-    if re.match(r"\d{1,2}_\d{1,2}_\d{4}", datestr):
-        val = site_format("fl")
-    elif re.match(r"\d{4}-\d{2}-\d{2}", datestr):
-        val = site_format("nfl")
-    elif re.match(r"\d{1,2}-\d{1,2}-\d{4}", datestr):
-        val = site_format("std")
-    elif re.match(r"\d{1,2}/\d{1,2}/\d{4}", datestr):
-        val = site_format("odd")
-    elif re.match(r"\d{8}", datestr):
-        val = site_format("db")
-    elif re.match(r"\w+ \d+, \d+", datestr):
-        val = site_format("bdy")
-    return val
+    return SITE_FORMATS.get(_site_key(datestr))
+
+
+def parse_dates(datestrs, errors="raise"):
+    """
+    Parses column of datestrings, formats can differ row to row. Each distinct
+    string is parsed once.
+
+    Args:
+        datestrs(iterable): of str
+        errors(str): 'raise', or 'coerce' to return None for invalid dates
+
+    Returns:
+        list: of datetime.datetime
+
+    """
+    parsed = {}
+    dates = []
+    for datestr in datestrs:
+        try:
+            dates.append(parsed[datestr])
+            continue
+        except KeyError:
+            pass
+        try:
+            value = _parse(datestr)
+        except (TypeError, ValueError):
+            if errors != "coerce":
+                raise
+            value = None
+        parsed[datestr] = value
+        dates.append(value)
+    return dates
+
+
+def strtodate64(datestrs, site=None, errors="raise"):
+    """
+    Parses array of datestrings in one call. If all values are zero-padded in
+    the site format, characters are rearranged into ISO strings and parsed by
+    numpy; otherwise formats are detected per value, once per distinct string.
+
+    Args:
+        datestrs(array-like): of str
+        site(str): expected format, e.g. 'fl', 'nfl', 'db', enables fast path
+        errors(str): 'raise', or 'coerce' to return NaT for invalid dates
+
+    Returns:
+        numpy.ndarray: of datetime64[D]
+
+    """
+    import numpy as np
+
+    values = np.asarray(datestrs, dtype=str)
+    shape = values.shape
+    values = values.ravel()
+    layout = _ISO_LAYOUTS.get(site)
+    if layout and values.size and (np.char.str_len(values) == len(layout)).all():
+        chars = _chars(values, len(layout))
+        iso = np.full((values.size, 10), "-", dtype="U1")
+        fixed = True
+        for col, src in enumerate(layout):
+            if isinstance(src, int):
+                iso[:, src] = chars[:, col]
+            elif not (chars[:, col] == src).all():
+                fixed = False
+                break
+        if fixed:
+            try:
+                return iso.view("U10").reshape(shape).astype("datetime64[D]")
+            except ValueError:
+                # invalid day or month somewhere, find it below
+                if errors != "coerce":
+                    raise
+
+    uniq, inverse = np.unique(values, return_inverse=True)
+    parsed = []
+    for datestr in uniq.tolist():
+        try:
+            parsed.append(_parse(datestr).date())
+        except (TypeError, ValueError):
+            if errors != "coerce":
+                raise
+            parsed.append(None)
+    return np.array(parsed, dtype="datetime64[D]")[inverse].reshape(shape)
 
 
 def site_format(site):
@@ -116,17 +362,7 @@ def site_format(site):
         str
 
     """
-    return {
-        "std": "%m-%d-%Y",
-        "fl": "%m_%d_%Y",
-        "fl2017": "%m-%d-%Y",
-        "fl_matchups": "%-m-%-d-%Y",
-        "nfl": "%Y-%m-%d",
-        "odd": "%m/%d/%Y",
-        "db": "%Y%m%d",
-        "bdy": "%B %d, %Y",
-        "espn_fantasy": "%Y%m%d",
-    }.get(site, None)
+    return SITE_FORMATS.get(site, None)
 
 
 def strtodate(dstr):
@@ -140,7 +376,7 @@ def strtodate(dstr):
         datetime.datetime
 
     """
-    return datetime.datetime.strptime(dstr, format_type(dstr))
+    return _parse(dstr)
 
 
 def subtract_datestr(date1, date2):
@@ -4,16 +4,54 @@ draft.py
 classes for DRAFT.com
 
 """
+import array
 import csv
+import datetime
 import json
 import logging
 import os
 
-from sportscraper import RequestScraper
+from sportscraper import AsyncRequestScraper
+from .cache import atomic_write
+from .jsonstream import iter_resource
 from .utility import merge_two
 
 
-class Scraper(RequestScraper):
+# keys kept from each resource, frozensets so filtering is one hash per key
+BOOKING_KEYS = frozenset(
+    ("id", "player_id", "booking_id", "adp", "position_id", "projected_points")
+)
+PLAYER_KEYS = frozenset(("first_name", "last_name", "team_id", "injury_status"))
+PICK_KEYS = frozenset(
+    ("booking_id", "id", "draft_roster_id", "pick_number", "slot_id", "source")
+)
+TEAM_KEYS = frozenset(("abbr", "city", "id", "nickname"))
+USER_KEYS = frozenset(("experienced", "id", "skill_level", "username"))
+ROSTER_KEYS = frozenset(("id", "user_id", "pick_order", "picks"))
+# values that change from draft to draft, so are never kept in PoolIndex
+DRAFT_BOOKING_KEYS = ("adp", "projected_points")
+DRAFT_PLAYER_KEYS = ("team_id", "injury_status")
+POOL_KEYS = frozenset(
+    (
+        "adp",
+        "first_name",
+        "last_name",
+        "player_id",
+        "pool_date",
+        "booking_id",
+        "season_year",
+        "player_pool_id",
+        "position",
+        "team",
+        "projected_points",
+    )
+)
+
+# arrays in draft and player_pool resources that are decoded item by item
+STREAM_KEYS = ("bookings", "players", "draft_rosters", "users")
+
+
+class Scraper(AsyncRequestScraper):
     """
 
     """
@@ -23,7 +61,7 @@ class Scraper(RequestScraper):
 
         Args:
 
-            **kwargs:
+            **kwargs: passed to AsyncRequestScraper, e.g. concurrency
 
         """
         headers = {
@@ -95,6 +133,23 @@ class Scraper(RequestScraper):
         except:
             return None
 
+    @staticmethod
+    def _json_file_stream(file_name, root=None, stream=STREAM_KEYS):
+        """
+        Parses JSON file from disk incrementally
+
+        Args:
+            file_name(str):
+            root(str): key wrapping resource, e.g. 'draft'
+            stream(iterable): keys of arrays to yield item by item
+
+        Returns:
+            iterator of tuple (key, value)
+
+        """
+        with open(file_name, "rb") as infile:
+            yield from iter_resource(infile, root=root, stream=stream)
+
     def adp(self, start_date, end_date, season_year, participants="", entry_cost=""):
         """
         Scrapes ADP dashboard
@@ -153,7 +208,7 @@ class Scraper(RequestScraper):
         return content
 
     def bestball_ownership_csv(
-        self, file_name=None, window_cluster_id=None, sport=None
+        self, file_name=None, window_cluster_id=None, sport=None, stream=False
     ):
         """
         Ownership data for one window cluster. Only file method works.
@@ -162,6 +217,7 @@ class Scraper(RequestScraper):
             file_name(str):
             window_cluster_id(int):
             sport(str):
+            stream(bool): return iterator of csv lines, e.g. for csv.DictReader
 
         Returns:
             dict
@@ -172,14 +228,15 @@ class Scraper(RequestScraper):
             content = Parser._csv_to_dict(file_name)
         if not content:
             url = f"https://draft.com/bbo-csv/{window_cluster_id}/all/{sport}/standard"
-            content = self.get(url)
+            content = self.get(url, stream=stream)
         return content
 
-    def clustered_complete_contests(self, file_name=None):
+    def clustered_complete_contests(self, file_name=None, refresh=False):
         """
 
         Args:
             file_name (str):
+            refresh (bool): revalidate cached copy with server
 
         Returns:
             dict
@@ -190,6 +247,8 @@ class Scraper(RequestScraper):
             contests = self._json_file(file_name)
         if not contests:
             url = "https://api.playdraft.com/v1/clustered_complete_contests"
+            if refresh:
+                self.expire(url)
             contests = self.get_json(url=url)
         return contests
 
@@ -213,13 +272,14 @@ class Scraper(RequestScraper):
             content = self.get_json(url=url)
         return content
 
-    def complete_contests(self, file_name=None, window_cluster_id=None):
+    def complete_contests(self, file_name=None, window_cluster_id=None, refresh=False):
         """
         Complete contests for one window cluster
 
         Args:
             file_name(str):
             window_cluster_id(int):
+            refresh(bool): revalidate cached copy with server
 
         Returns:
             dict
@@ -233,6 +293,8 @@ class Scraper(RequestScraper):
                 f"https://api.playdraft.com/v2/window_clusters/"
                 f"{window_cluster_id}/complete_contests"
             )
+            if refresh:
+                self.expire(url)
             content = self.get_json(url=url)
         return content
 
@@ -256,15 +318,37 @@ class Scraper(RequestScraper):
             content = self.get_json(url=url)
         return content
 
-    def draft(self, league_id=None, file_name=None):
+    def contest_results_many(self, contest_ids):
+        """
+        Complete results for many contests, fetched concurrently
+
+        Args:
+            contest_ids(list): of str
+
+        Returns:
+            iterator: of (contest_id, dict) in completion order, exception
+                instead of dict if contest could not be fetched
+
+        """
+        urls = {
+            f"https://api.playdraft.com/v2/series_contests/{contest_id}": contest_id
+            for contest_id in contest_ids
+        }
+        for url, content in self.iter_json_many(urls, return_exceptions=True):
+            yield urls[url], content
+
+    def draft(self, league_id=None, file_name=None, stream=False):
         """
 
         Args:
             league_id (str):
             file_name (str):
+            stream (bool): parse incrementally, see Parser.compact. Streamed
+                responses are not stored, so with a cache the draft is
+                downloaded whole and returned as dict.
 
         Returns:
-            dict
+            dict, or iterator of tuple (key, value) if streamed
 
         """
         headers = {
@@ -280,8 +364,15 @@ class Scraper(RequestScraper):
             "if-none-match": 'W/"3beb6c9474cc2303bb9ef39a22229028"',
         }
 
-        if file_name:
+        if file_name and stream:
+            return self._json_file_stream(file_name, root="draft")
+        elif file_name:
             return self._json_file(file_name)
+        elif league_id and stream and self.cache is None:
+            url = f"https://api.playdraft.com/v3/drafts/{league_id}"
+            return self.get_json_stream(
+                url, root="draft", stream=STREAM_KEYS, headers=headers
+            )
         elif league_id:
             url = f"https://api.playdraft.com/v3/drafts/{league_id}"
             return self.get_json(url=url, headers=headers)
@@ -300,19 +391,29 @@ class Scraper(RequestScraper):
         """
         pass
 
-    def player_pool(self, pool_id=None, file_name=None):
+    def player_pool(self, pool_id=None, file_name=None, stream=False):
         """
 
         Args:
             pool_id (int):
             file_name (dict):
+            stream (bool): parse incrementally, see Parser.compact. Streamed
+                responses are not stored, so with a cache the pool is
+                downloaded whole and returned as dict.
 
         Returns:
-            dict
+            dict, or iterator of tuple (key, value) if streamed
 
         """
-        if file_name:
+        if file_name and stream:
+            return self._json_file_stream(file_name, root="player_pool")
+        elif file_name:
             return self._json_file(file_name)
+        elif pool_id and stream and self.cache is None:
+            url = "https://api.playdraft.com/v5/player_pool/{}"
+            return self.get_json_stream(
+                url.format(pool_id), root="player_pool", stream=STREAM_KEYS
+            )
         elif pool_id:
             url = "https://api.playdraft.com/v5/player_pool/{}"
             return self.get_json(url.format(pool_id))
@@ -402,6 +503,197 @@ class Scraper(RequestScraper):
         return content
 
 
+class PoolIndex:
+    """
+    Players in one player pool keyed by booking_id, with team and position
+    resolved. Drafts from the same time window share a pool, so the index is
+    built once and reused for every draft. Only static data is kept, adp,
+    projected_points, team and injury status come from each draft's own
+    bookings and players.
+
+    """
+
+    def __init__(self, content):
+        """
+        Builds index
+
+        Args:
+            content(dict): draft or player_pool resource, needs bookings,
+                players, teams and positions
+
+        """
+        self.time_window_id = content.get("time_window_id")
+        self.teams = [
+            {k: v for k, v in t.items() if k in TEAM_KEYS} for t in content["teams"]
+        ]
+        self.teamsd = {t["id"]: t["abbr"] for t in self.teams}
+        self.positions = {int(pos["id"]): pos["name"] for pos in content["positions"]}
+        self.players = {}
+        for p in Parser._combine_bookings_players(
+            content["bookings"], content["players"]
+        ):
+            p["position"] = self.positions.get(p["position_id"])
+            for k in DRAFT_BOOKING_KEYS + DRAFT_PLAYER_KEYS:
+                p.pop(k, None)
+            self.players[p["booking_id"]] = p
+
+    def __contains__(self, booking_id):
+        return booking_id in self.players
+
+    def __len__(self):
+        return len(self.players)
+
+    def get(self, booking_id):
+        """
+        Gets player for booking
+
+        Args:
+            booking_id(int):
+
+        Returns:
+            dict or None
+
+        """
+        return self.players.get(booking_id)
+
+
+class PickColumns:
+    """
+    Draft picks stored column by column in typed arrays, about 45 bytes a
+    pick. user_id is stored as codes into users, like a pandas Categorical.
+
+    Usage:
+        columns = Parser().draft_picks_many(drafts, columnar=True)
+        df = columns.to_dataframe()
+
+    """
+
+    # column name: array typecode
+    COLUMNS = {
+        "league_id": "q",
+        "pick_number": "q",
+        "booking_id": "q",
+        "user_id": "i",
+        "adp": "d",
+        "projected_points": "d",
+    }
+
+    def __init__(self):
+        """
+        Creates empty columns
+
+        """
+        self.columns = {
+            name: array.array(typecode) for name, typecode in self.COLUMNS.items()
+        }
+        self.users = []
+        self._user_codes = {}
+
+    def __len__(self):
+        return len(self.columns["booking_id"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def _user_code(self, user_id):
+        """
+        Gets category code for user, adding user if new
+
+        Args:
+            user_id(int):
+
+        Returns:
+            int
+
+        """
+        code = self._user_codes.get(user_id)
+        if code is None:
+            code = len(self.users)
+            self._user_codes[user_id] = code
+            self.users.append(user_id)
+        return code
+
+    def extend(self, league_id, matches):
+        """
+        Appends picks from one draft, skipping picks without a player. adp
+        and projected_points are read from the draft's own booking.
+
+        Args:
+            league_id(int):
+            matches(iterable): of tuple (user_id, pick, player, booking,
+                draft player), see Parser._pick_matches
+
+        Returns:
+            None
+
+        """
+        c = self.columns
+        nan = float("nan")
+        for user_id, pk, match, booking, _ in matches:
+            if not match:
+                logging.info("no bookings match for %s", pk.get("id"))
+                continue
+            c["league_id"].append(league_id)
+            c["pick_number"].append(pk["pick_number"])
+            c["booking_id"].append(pk["booking_id"])
+            c["user_id"].append(self._user_code(user_id))
+            adp = booking.get("adp")
+            c["adp"].append(nan if adp is None else float(adp))
+            points = booking.get("projected_points")
+            c["projected_points"].append(nan if points is None else float(points))
+
+    def user_ids(self):
+        """
+        Decodes user_id column
+
+        Returns:
+            list: of int
+
+        """
+        return [self.users[code] for code in self.columns["user_id"]]
+
+    def to_dataframe(self):
+        """
+        Converts to pandas DataFrame, user_id as a Categorical. Requires pandas.
+
+        Returns:
+            DataFrame
+
+        """
+        import numpy as np
+        import pandas as pd
+
+        data = {
+            name: np.frombuffer(col, dtype=col.typecode)
+            for name, col in self.columns.items()
+        }
+        data["user_id"] = pd.Categorical.from_codes(
+            data["user_id"], categories=self.users
+        )
+        return pd.DataFrame(data)
+
+    def to_arrow(self):
+        """
+        Converts to pyarrow Table, user_id as a dictionary column.
+        Requires pyarrow.
+
+        Returns:
+            Table
+
+        """
+        import numpy as np
+        import pyarrow as pa
+
+        data = {
+            name: pa.array(np.frombuffer(col, dtype=col.typecode))
+            for name, col in self.columns.items()
+        }
+        data["user_id"] = pa.DictionaryArray.from_arrays(
+            data["user_id"], pa.array(self.users)
+        )
+        return pa.table(data)
+
+
 class Parser:
     def __init__(self):
         """
@@ -409,6 +701,7 @@ class Parser:
         """
         logging.getLogger(__name__).addHandler(logging.NullHandler())
         self.data = {}
+        self._pool_indexes = {}
         self._sport_ids = {1: "nfl", 2: "nba"}
         self._team_ids = {
             1: {
@@ -488,29 +781,20 @@ class Parser:
 
         # go through bookings first
         # create bookings dict with player_id: player_dict
-        b_wanted = [
-            "id",
-            "player_id",
-            "booking_id",
-            "adp",
-            "position_id",
-            "projected_points",
-        ]
         bookingsd = {}
         for b in bookings:
             pid = b["player_id"]
-            bd = {k: v for k, v in b.items() if k in b_wanted}
+            bd = {k: v for k, v in b.items() if k in BOOKING_KEYS}
             bd["booking_id"] = bd.pop("id")
             bookingsd[pid] = bd
 
         # now try to match up with players
-        p_wanted = ["first_name", "last_name", "team_id", "injury_status"]
         for p in players:
             match = bookingsd.get(p["id"])
             if match:
                 merged.append(
                     merge_two(
-                        match, {k: v for k, v in p.items() if k in p_wanted}
+                        match, {k: v for k, v in p.items() if k in PLAYER_KEYS}
                     )
                 )
         return merged
@@ -526,8 +810,7 @@ class Parser:
             tuple
 
         """
-        twanted = ["abbr", "city", "id", "nickname"]
-        self.teams = [{k: v for k, v in t.items() if k in twanted} for t in teams]
+        self.teams = [{k: v for k, v in t.items() if k in TEAM_KEYS} for t in teams]
         self.teamsd = {t["id"]: t["abbr"] for t in self.teams}
         return (self.teams, self.teamsd)
 
@@ -614,6 +897,44 @@ class Parser:
             window_cluster_dicts.append(wc_dict)
         return window_cluster_dicts
 
+    @staticmethod
+    def compact(items):
+        """
+        Builds draft or player_pool resource from streamed fields, keeping only
+        the keys the parsers use, so the full document is never held
+
+        Args:
+            items(iterable): of tuple (key, value), from Scraper.draft or
+                Scraper.player_pool with stream=True
+
+        Returns:
+            dict
+
+        """
+        content = {key: [] for key in STREAM_KEYS}
+        for key, value in items:
+            if key == "bookings":
+                value = {k: v for k, v in value.items() if k in BOOKING_KEYS}
+            elif key == "players":
+                value = {
+                    k: v for k, v in value.items() if k in PLAYER_KEYS or k == "id"
+                }
+            elif key == "users":
+                value = {k: v for k, v in value.items() if k in USER_KEYS}
+            elif key == "draft_rosters":
+                value = {k: v for k, v in value.items() if k in ROSTER_KEYS}
+                value["picks"] = [
+                    {k: v for k, v in pk.items() if k in PICK_KEYS}
+                    for pk in value.get("picks", [])
+                ]
+            elif key == "teams":
+                value = [{k: v for k, v in t.items() if k in TEAM_KEYS} for t in value]
+            if key in STREAM_KEYS:
+                content[key].append(value)
+            else:
+                content[key] = value
+        return content
+
     def complete_contests(self, content):
         """
         Parses complete_contests resource. Does not get list of draft picks.
@@ -683,61 +1004,111 @@ class Parser:
 
         return contest_metadata, teams, users, weekly_results
 
-    def draft_picks(self, draft):
+    def _pick_matches(self, draft):
+        """
+        Pairs each pick in draft with its player from the PoolIndex and its
+        booking and player from this draft, which hold the values that change
+        between drafts. Sets teams and teamsd from the PoolIndex.
+
+        Args:
+            draft (dict): draft resource, without top-level 'draft' key
+
+        Returns:
+            generator: of tuple (user_id, pick, player dict or None, booking,
+                draft player)
+
+        """
+        time_window_id = draft.get("time_window_id")
+        fresh = time_window_id is None or time_window_id not in self._pool_indexes
+        index = self.pool_index(draft)
+        self.teams, self.teamsd = index.teams, index.teamsd
+        bookings = {b["id"]: b for b in draft["bookings"]}
+        players = {p["id"]: p for p in draft["players"]}
+        for t in draft["draft_rosters"]:
+            user_id = t["user_id"]
+            for pk in t["picks"]:
+                booking = bookings.get(pk["booking_id"])
+                player = players.get(booking["player_id"]) if booking else None
+                if player is None:
+                    yield user_id, pk, None, None, None
+                    continue
+                match = index.get(pk["booking_id"])
+                if match is None and not fresh:
+                    # pool changed since index was built from an earlier draft
+                    index = self.pool_index(draft, refresh=True)
+                    self.teams, self.teamsd = index.teams, index.teamsd
+                    fresh = True
+                    match = index.get(pk["booking_id"])
+                yield user_id, pk, match, booking, player
+
+    def draft_picks(self, draft, columns=None):
         """
         Parses single draft resource into picks
 
         Args:
-            draft (dict):
+            draft (dict): or iterator of tuple (key, value) if streamed
+            columns (PickColumns): append picks to columns instead of
+                returning dicts
 
         Returns:
-            list: of dict
+            list: of dict, or PickColumns if columns given
 
         """
         picks = []
+        if not isinstance(draft, dict):
+            draft = self.compact(draft)
         if draft.get("draft"):
             draft = draft["draft"]
-        teams, teamsd = self._teams(draft["teams"])
-        posd = {int(pos["id"]): pos["name"] for pos in draft["positions"]}
+        if columns is not None:
+            columns.extend(draft["id"], self._pick_matches(draft))
+            return columns
 
-        # players
-        players = []
-        for p in self._combine_bookings_players(draft["bookings"], draft["players"]):
-            tid = p.get("team_id")
-            if tid:
-                p["team_abbr"] = teamsd.get(tid, "FA")
+        # picks
+        league_id = draft["id"]
+        for user_id, pk, match, booking, player in self._pick_matches(draft):
+            pick = {k: v for k, v in pk.items() if k in PICK_KEYS}
+            pick["user_id"] = user_id
+            pick["league_id"] = league_id
+
+            # add player data
+            if match:
+                pick.update(match)
+                # values that change between drafts, never kept in PoolIndex
+                for k in DRAFT_BOOKING_KEYS:
+                    if k in booking:
+                        pick[k] = booking[k]
+                for k in DRAFT_PLAYER_KEYS:
+                    if k in player:
+                        pick[k] = player[k]
+                tid = player.get("team_id")
+                pick["team_abbr"] = self.teamsd.get(tid, "FA") if tid else "FA"
+                picks.append(pick)
             else:
-                p["team_abbr"] = "FA"
+                logging.info("no bookings match for %s" % pick)
+        return picks
 
-            p["position"] = posd.get(p["position_id"])
-            players.append(p)
+    def draft_picks_many(self, drafts, columnar=False):
+        """
+        Parses many draft resources into picks. Drafts from the same time
+        window reuse one PoolIndex.
 
-        # bookings_xref
-        player_bookings_d = {p["booking_id"]: p for p in players}
+        Args:
+            drafts(iterable): of dict
+            columnar(bool): return PickColumns, which takes a fraction of
+                the memory of one dict per pick
 
-        # picks
-        rosters = draft["draft_rosters"]
-        pkwanted = [
-            "booking_id",
-            "id",
-            "draft_roster_id",
-            "pick_number",
-            "slot_id",
-            "source",
-        ]
-        for t in rosters:
-            for pick in [
-                {k: v for k, v in pk.items() if k in pkwanted} for pk in t["picks"]
-            ]:
-                pick["user_id"] = t["user_id"]
-                pick["league_id"] = draft["id"]
-
-                # add player data
-                match = player_bookings_d.get(pick["booking_id"])
-                if match:
-                    picks.append(merge_two(pick, match))
-                else:
-                    logging.info("no bookings match for %s" % pick)
+        Returns:
+            list: of dict, or PickColumns
+
+        """
+        if columnar:
+            columns = PickColumns()
+            for draft in drafts:
+                self.draft_picks(draft, columns=columns)
+            return columns
+        picks = []
+        for draft in drafts:
+            picks.extend(self.draft_picks(draft))
         return picks
 
     def draft_users(self, draft):
@@ -753,9 +1124,8 @@ class Parser:
         """
         if draft.get("draft"):
             draft = draft["draft"]
-        uwanted = ["experienced", "id", "skill_level", "username"]
         users = [
-            {k: v for k, v in user.items() if k in uwanted} for user in draft["users"]
+            {k: v for k, v in user.items() if k in USER_KEYS} for user in draft["users"]
         ]
         league_users = [
             {
@@ -767,18 +1137,43 @@ class Parser:
         ]
         return users, league_users
 
+    def pool_index(self, content, refresh=False):
+        """
+        Gets PoolIndex for time window of draft, building it on first use
+
+        Args:
+            content(dict): draft or player_pool resource
+            refresh(bool): rebuild index from content even if cached
+
+        Returns:
+            PoolIndex
+
+        """
+        time_window_id = content.get("time_window_id")
+        index = None
+        if time_window_id is not None and not refresh:
+            index = self._pool_indexes.get(time_window_id)
+        if index is None:
+            index = PoolIndex(content)
+            if time_window_id is not None:
+                self._pool_indexes[time_window_id] = index
+        return index
+
     def player_pool(self, pp, pool_date):
         """
         Parses player_pool resource
 
         Args:
-            pp (dict): player_pool resource - parsed JSON into dict
+            pp (dict): player_pool resource - parsed JSON into dict, or
+                iterator of tuple (key, value) if streamed
             pool_date (str): e.g. '2018-04-10'
 
         Returns:
             list: of dict
 
         """
+        if not isinstance(pp, dict):
+            pp = self.compact(pp)
         # no need for top-level 'player_pool' key
         if pp.get("player_pool"):
             pp = pp["player_pool"]
@@ -790,26 +1185,13 @@ class Parser:
 
         # loop through booking + player and add fields
         players = []
-        ppwanted = [
-            "adp",
-            "first_name",
-            "last_name",
-            "player_id",
-            "pool_date",
-            "booking_id",
-            "season_year",
-            "player_pool_id",
-            "position",
-            "team",
-            "projected_points",
-        ]
         for pl in self._combine_bookings_players(pp["bookings"], pp["players"]):
             pl["player_pool_id"] = player_pool_id
             pl["position"] = posd.get(pl["position_id"])
             pl["team"] = teamsd.get(pl["team_id"], "FA")
             pl["pool_date"] = pool_date
             pl["season_year"] = int(pool_date[0:4])
-            players.append({k: v for k, v in pl.items() if k in ppwanted})
+            players.append({k: v for k, v in pl.items() if k in POOL_KEYS})
         return players
 
     def sport_ids(self, sport_id):
@@ -854,6 +1236,167 @@ class Parser:
         return [Parser._contest_result(contest) for contest in contests]
 
 
+class SyncState:
+    """
+    Leagues already processed and draft_time high-water mark for each window
+    cluster, kept in a JSON file between runs. Leagues drafted more than
+    grace_days before the high-water mark are pruned and treated as seen, so
+    the file stays the size of the grace window rather than of all history.
+    The mark only advances once every listed league has been recorded, so a
+    failed run never hides leagues it did not get to.
+
+    """
+
+    def __init__(self, file_name, grace_days=7):
+        """
+        Loads state, empty if file does not exist yet
+
+        Args:
+            file_name(str):
+            grace_days(int): how long after the high-water mark a draft can
+                still finish, default 7
+
+        """
+        self.file_name = file_name
+        self.grace = datetime.timedelta(days=grace_days)
+        self.clusters = {}
+        if os.path.exists(file_name):
+            with open(file_name, "r") as infile:
+                for cluster_id, cluster in json.load(infile).items():
+                    self.clusters[cluster_id] = {
+                        "draft_time": cluster.get("draft_time"),
+                        "leagues": cluster.get("leagues", {}),
+                    }
+
+    def _cluster(self, cluster_id):
+        """
+        State for one window cluster
+
+        """
+        return self.clusters.setdefault(
+            str(cluster_id), {"draft_time": None, "leagues": {}}
+        )
+
+    def high_water(self, cluster_id):
+        """
+        Latest draft_time seen in window cluster
+
+        Args:
+            cluster_id(int):
+
+        Returns:
+            str or None
+
+        """
+        return self._cluster(cluster_id)["draft_time"]
+
+    def cutoff(self, cluster_id):
+        """
+        Leagues drafted before cutoff are treated as seen
+
+        Args:
+            cluster_id(int):
+
+        Returns:
+            str: '%Y-%m-%dT%H:%M:%S', None if nothing seen yet
+
+        """
+        high_water = self.high_water(cluster_id)
+        if not high_water:
+            return None
+        latest = datetime.datetime.strptime(high_water[:19], "%Y-%m-%dT%H:%M:%S")
+        return (latest - self.grace).strftime("%Y-%m-%dT%H:%M:%S")
+
+    def is_new(self, cluster_id, league):
+        """
+        Tests if league has not been seen. Drafts can complete out of
+        draft_time order, so ids decide within the grace window.
+
+        Args:
+            cluster_id(int):
+            league(dict): from complete_contests, needs id and draft_time
+
+        Returns:
+            bool
+
+        """
+        if str(league["id"]) in self._cluster(cluster_id)["leagues"]:
+            return False
+        cutoff = self.cutoff(cluster_id)
+        draft_time = league.get("draft_time")
+        return not (cutoff and draft_time) or draft_time[:19] >= cutoff
+
+    def add(self, cluster_id, league):
+        """
+        Records league as seen, does not move the high-water mark
+
+        Args:
+            cluster_id(int):
+            league(dict): from complete_contests, needs id and draft_time
+
+        Returns:
+            None
+
+        """
+        cluster = self._cluster(cluster_id)
+        cluster["leagues"][str(league["id"])] = league.get("draft_time")
+
+    def advance(self, cluster_id, leagues):
+        """
+        Moves high-water mark to latest draft_time in leagues. Call only once
+        every one of leagues has been recorded or was already seen.
+
+        Args:
+            cluster_id(int):
+            leagues(list): of dict, from complete_contests
+
+        Returns:
+            None
+
+        """
+        cluster = self._cluster(cluster_id)
+        for draft_time in (league.get("draft_time") for league in leagues):
+            high_water = cluster["draft_time"]
+            if draft_time and (not high_water or draft_time > high_water):
+                cluster["draft_time"] = draft_time
+
+    def prune(self):
+        """
+        Drops leagues drafted before cutoff
+
+        Returns:
+            int: number of leagues dropped
+
+        """
+        pruned = 0
+        for cluster_id, cluster in self.clusters.items():
+            cutoff = self.cutoff(cluster_id)
+            if not cutoff:
+                continue
+            old = [
+                league_id
+                for league_id, draft_time in cluster["leagues"].items()
+                if draft_time and draft_time[:19] < cutoff
+            ]
+            for league_id in old:
+                del cluster["leagues"][league_id]
+            pruned += len(old)
+        return pruned
+
+    def save(self):
+        """
+        Prunes and writes state, atomically so a crash never leaves a partial
+        file
+
+        Returns:
+            None
+
+        """
+        self.prune()
+        data = json.dumps(self.clusters, sort_keys=True).encode("utf-8")
+        atomic_write(self.file_name, lambda outfile: outfile.write(data))
+
+
 class Agent:
     """
     Combines common scraping/parsing functions
@@ -869,63 +1412,153 @@ class Agent:
 
     """
 
-    def __init__(self, cache_name="DRAFT-agent"):
+    def __init__(self, cache_name="DRAFT-agent", **kwargs):
         """
 
+        Args:
+            cache_name(str):
+            **kwargs: passed to Scraper, e.g. transport to share connections
+
         """
         logging.getLogger(__name__).addHandler(logging.NullHandler())
-        self.s = Scraper(cache_name=cache_name)
+        self.s = Scraper(cache_name=cache_name, **kwargs)
         self.p = Parser()
 
-    def bestball_leagues(self):
+    def bestball_leagues(self, state_file=None):
         """
         Gets bestball leagues, auto-determines cluster
 
+        Args:
+            state_file(str): JSON file of leagues already processed. If given,
+                only leagues not processed on earlier runs are yielded, and
+                each is recorded once the caller is done with it.
+
         Returns:
-            list: of dict
+            list: of dict, or iterator of dict if state_file
 
         """
+        refresh = bool(state_file)
         try:
-            content = self.s.clustered_complete_contests()
+            content = self.s.clustered_complete_contests(refresh=refresh)
             bestball_cluster_id = [
                 cl["id"]
                 for cl in content["window_clusters"]
                 if "Best Ball" in cl["header_text"]
             ][0]
-            content = self.s.complete_contests(window_cluster_id=bestball_cluster_id)
-            return self.p.complete_contests(content)
+            content = self.s.complete_contests(
+                window_cluster_id=bestball_cluster_id, refresh=refresh
+            )
         except IndexError as ie:
             logging.exception("no bestball leagues available")
             return None
+        if not state_file:
+            return self.p.complete_contests(content)
+        return self._new_leagues(SyncState(state_file), bestball_cluster_id, content)
+
+    def _new_leagues(self, state, cluster_id, content):
+        """
+        Yields leagues not in state, recording each after caller is done with it
+
+        Args:
+            state(SyncState):
+            cluster_id(int):
+            content(dict): complete_contests resource
+
+        Returns:
+            iterator: of dict
+
+        """
+        drafts = [dr for dr in content["drafts"] if state.is_new(cluster_id, dr)]
+        logging.info(
+            "%s new leagues, latest before was %s",
+            len(drafts),
+            state.high_water(cluster_id),
+        )
+        try:
+            for dr, league in zip(drafts, self.p.complete_contests({"drafts": drafts})):
+                yield league
+                # record once caller is done with league, so it is not lost
+                state.add(cluster_id, dr)
+            # every listed league is now recorded, so mark can move past them
+            state.advance(cluster_id, content["drafts"])
+        finally:
+            state.save()
+
+    def contest_results(self, window_cluster_id, checkpoint=None):
+        """
+        Gets and parses results of every contest in a window cluster, yielding
+        each as it completes. Contests that fail are logged and left for the
+        next run.
 
-    def draft(self, league_id):
+        Args:
+            window_cluster_id(int):
+            checkpoint(str): file of finished contest ids, skipped on later runs
+
+        Returns:
+            iterator: of (contest_metadata, teams, users, weekly_results)
+
+        """
+        finished = set()
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint, "r") as infile:
+                finished = {line.strip() for line in infile if line.strip()}
+        content = self.s.window_cluster_results(window_cluster_id=window_cluster_id)
+        contest_ids = [
+            contest["id"]
+            for contest in self.p.window_cluster_results(content)
+            if str(contest["id"]) not in finished
+        ]
+        logging.info(
+            "%s contests to get, %s already finished", len(contest_ids), len(finished)
+        )
+
+        outfile = open(checkpoint, "a") if checkpoint else None
+        try:
+            for contest_id, content in self.s.contest_results_many(contest_ids):
+                if isinstance(content, Exception):
+                    logging.error("could not get contest %s: %s", contest_id, content)
+                    continue
+                yield self.p.contest_results(content)
+                # checkpoint once caller is done with contest, so it is not lost
+                if outfile:
+                    outfile.write(f"{contest_id}\n")
+                    outfile.flush()
+        finally:
+            if outfile:
+                outfile.close()
+
+    def draft(self, league_id, stream=False):
         """
 
         Args:
             league_id(str):
+            stream(bool): parse response as it arrives, keeping only used keys
 
         Returns:
             picks, users, user_league
 
         """
-        content = self.s.draft(league_id=league_id)
+        content = self.s.draft(league_id=league_id, stream=stream)
+        if not isinstance(content, dict):
+            content = self.p.compact(content)
         users, user_league = self.p.draft_users(content)
         picks = self.p.draft_picks(content)
         return picks, users, user_league
 
-    def player_pool(self, pool_id, pool_date):
+    def player_pool(self, pool_id, pool_date, stream=False):
         """
         Gets player pool
 
         Args:
             pool_id(int): player pool id
             pool_date(str): in '%Y-%m-%d' format
+            stream(bool): parse response as it arrives, keeping only used keys
 
         Returns:
             list: of dict
 
         """
-        content = self.s.player_pool(pool_id=pool_id)
+        content = self.s.player_pool(pool_id=pool_id, stream=stream)
         return self.p.player_pool(content, pool_date)
 
 
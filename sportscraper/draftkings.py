@@ -35,7 +35,7 @@ class Scraper(RequestScraper):
         url = "https://www.draftkings.com/lobby/getcontests"
         if sport:
             params = {"sport": sport}
-            return self.get_json(url, params)
+            return self.get_json(url, payload=params)
         return self.get_json(url)
 
     def draftables(self, draft_group_id):
@@ -55,19 +55,23 @@ class Scraper(RequestScraper):
         )
         return self.get_json(url.format(draft_group_id))
 
-    def salaries(self, draft_group_id):
+    def salaries(self, draft_group_id, stream=False):
         """
         Gets salaries csv file
 
+        Args:
+            draft_group_id(int): draftgroup ID
+            stream(bool): return iterator of lines rather than str
+
         Returns:
-            str
+            str, or iterator of str if stream
 
         """
         csv_url = (
             f"https://www.draftkings.com/lineup/getavailableplayerscsv?"
             f"draftGroupId={draft_group_id}"
         )
-        return self.get(csv_url)
+        return self.get(csv_url, stream=stream)
 
 
 class BScraper(BrowserScraper):
@@ -76,7 +80,7 @@ class BScraper(BrowserScraper):
 
     """
 
-    def __init__(self, profile, visible=False, polite=True):
+    def __init__(self, profile, visible=False, polite=True, hybrid=False, **kwargs):
         """
         Opens selenium scraper
 
@@ -84,20 +88,39 @@ class BScraper(BrowserScraper):
             profile(str):  path to browser profile
             visible(bool): default False
             polite(bool): defa
+            hybrid(bool): get contests and draftables over HTTP with browser cookies
+            **kwargs: passed to BrowserScraper, e.g. cache
 
         """
         logging.getLogger(__name__).addHandler(logging.NullHandler())
-        BrowserScraper.__init__(self, profile=profile, visible=visible)
+        BrowserScraper.__init__(self, profile=profile, visible=visible, **kwargs)
         self.polite = polite
+        self.hybrid = hybrid
+        self._scraper = None
 
     def _polite(self):
         """
-        Adds small random delay
+        Adds small random delay, unless page came from cache
 
         """
-        if self.polite:
+        if self.polite and self.provenance[-1][1] != "cache":
             sleep(random() * randint(1, 5))
 
+    def scraper(self):
+        """
+        Scraper with this browser's cookies, visits the lobby first if the
+        browser has not been to draftkings yet
+
+        Returns:
+            Scraper
+
+        """
+        if self._scraper is None:
+            if "draftkings.com" not in self.browser.current_url:
+                self.browser.get("https://www.draftkings.com/lobby")
+            self._scraper = self.request_scraper(Scraper)
+        return self._scraper
+
     def contests(self, sport=None):
         """
         Gets dk contests
@@ -109,6 +132,8 @@ class BScraper(BrowserScraper):
             dict
 
         """
+        if self.hybrid:
+            return self.scraper().contests(sport)
         url = "https://www.draftkings.com/lobby/getcontests"
         if sport:
             url += f"?sport={sport}"
@@ -125,6 +150,8 @@ class BScraper(BrowserScraper):
             dict
 
         """
+        if self.hybrid:
+            return self.scraper().draftables(draft_group_id)
         url = (
             "https://api.draftkings.com/draftgroups/v1/draftgroups/"
             "{}/draftables?format=json"
@@ -272,27 +299,41 @@ class Parser:
         ]
         return self.data["draftables"]
 
+    @staticmethod
+    def iter_salaries(content):
+        """
+        Parses salaries csv file one row at a time
+
+        Args:
+            content(str): csv, or iterable of lines from Scraper.salaries(stream=True)
+
+        Returns:
+            iterator of dict
+
+        """
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        if isinstance(content, str):
+            content = io.StringIO(content)
+        headers = None
+        for line in content:
+            if headers is None:
+                headers = line.split(",")
+            else:
+                yield dict(zip(headers, line.split(",")))
+
     def salaries(self, content):
         """
         Parses salaries csv file
 
         Args:
-            content(str):
+            content(str): csv, or iterable of lines from Scraper.salaries(stream=True)
 
         Returns:
             list: of dict
 
         """
-        try:
-            handle = io.StringIO(content)
-        except:
-            handle = io.BytesIO(content)
-        self.data["sals"] = []
-        for idx, line in enumerate(handle):
-            if idx == 0:
-                headers = line.split(",")
-            else:
-                self.data["sals"].append(dict(zip(headers, line.split(","))))
+        self.data["sals"] = list(self.iter_salaries(content))
         return self.data["sals"]
 
     def slate_entries(self, file_name):
@@ -348,17 +389,26 @@ class Agent:
 
     """
 
-    def __init__(self, cache_name=None, profile=None):
+    def __init__(self, cache_name=None, profile=None, bscraper=None, **kwargs):
         """
 
+        Args:
+            cache_name(str):
+            profile(str): path to browser profile
+            bscraper(BScraper): use existing browser, e.g. leased from BrowserPool
+            **kwargs: passed to Scraper, e.g. transport to share connections
+
         """
         logging.getLogger(__name__).addHandler(logging.NullHandler())
         if not cache_name and profile:
             raise ValueError("must specify cache_name, profile, or both")
         if cache_name:
-            self.scraper = Scraper(cache_name=cache_name)
-        if profile:
-            self.bscraper = BScraper(profile)
+            self.scraper = Scraper(cache_name=cache_name, **kwargs)
+        if bscraper:
+            self.bscraper = bscraper
+        elif profile:
+            cache = self.scraper.cache if cache_name else None
+            self.bscraper = BScraper(profile, cache=cache)
         self.parser = Parser()
         self.data = {}
 
@@ -411,7 +461,11 @@ class Agent:
             list: of dict
 
         """
-        return self.parser.salaries(self.scraper.salaries(draft_group_id))
+        # streamed responses are not stored, so only stream without a cache
+        stream = self.scraper.cache is None
+        return self.parser.salaries(
+            self.scraper.salaries(draft_group_id, stream=stream)
+        )
 
 
 if __name__ == "__main__":
@@ -15,6 +15,7 @@ Usage:
 
 """
 
+import json
 import logging
 from random import random, randint
 from time import sleep
@@ -31,6 +32,8 @@ class BScraper(BrowserScraper):
 
     def model(self, sport, datestr=None, model_id="1950741"):
         """
+        In capture mode, takes the model the player-models page already
+        downloaded instead of requesting it again
 
         Args:
             sport(str): 'nba', etc.
@@ -49,7 +52,17 @@ class BScraper(BrowserScraper):
                 f"https://www.fantasylabs.com/api/playermodel/2/"
                 f"{datestr}/?modelId={model_id}&projOnly=true"
             )
+            cached = self._cached(model_url)
+            if cached is not None:
+                self.urls.append(model_url)
+                return json.loads(cached)
             self.get(referrer_url)
+            # a cached referrer page made no requests to capture
+            if self.capture and self.provenance[-1][1] == "network":
+                pattern = f"/api/playermodel/2/{datestr}/.*modelId={model_id}"
+                for model in self.captured_json(pattern, wait=10).values():
+                    self._store(model_url, json.dumps(model), "application/json")
+                    return model
             sleep(randint(1, 3) * random())
             return self.get_json(model_url)
         else:
@@ -122,20 +135,22 @@ class Agent:
 
     """
 
-    def __init__(self, profile, sport):
+    def __init__(self, profile, sport, scraper=None, **kwargs):
         """
         Creates Agent object
 
         Args:
             profile(str): filename of profile
             sport(str): 'nba', 'nfl', etc.
+            scraper(BScraper): use existing browser, e.g. leased from BrowserPool
+            **kwargs: passed to BScraper, e.g. cache_name to reuse pages on reruns
 
         Returns:
             Agent
 
         """
         logging.getLogger(__name__).addHandler(logging.NullHandler())
-        self.scraper = BScraper(profile=profile)
+        self.scraper = scraper or BScraper(profile=profile, **kwargs)
         self.parser = Parser()
         self.sport = sport
 
@@ -0,0 +1,160 @@
+"""
+jsonstream.py
+
+Incremental parsing of large JSON resources, so big arrays are decoded one
+item at a time instead of all at once
+
+"""
+
+import io
+import json
+
+
+def backend():
+    """
+    Gets ijson if installed
+
+    Returns:
+        module or None
+
+    """
+    try:
+        import ijson
+    except ImportError:
+        return None
+    return ijson
+
+
+class IterReader(io.RawIOBase):
+    """
+    Read-only binary file over an iterator of bytes chunks, e.g. a streamed
+    response body
+
+    """
+
+    def __init__(self, chunks):
+        """
+
+        Args:
+            chunks(iterable): of bytes
+
+        """
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        """
+        Fills buffer from next chunks
+
+        Args:
+            buffer(memoryview):
+
+        Returns:
+            int: bytes read, 0 at end
+
+        """
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def iter_resource(fileobj, root=None, stream=()):
+    """
+    Yields top-level fields of JSON object, each array named in stream one
+    item at a time. Falls back to json.load when ijson is not installed, which
+    has the same output but not bounded memory.
+
+    Args:
+        fileobj(file): opened in binary mode
+        root(str): key wrapping resource, e.g. 'draft', skipped if present
+        stream(iterable): keys of arrays to yield item by item
+
+    Returns:
+        iterator of tuple (key, value)
+
+    """
+    stream = frozenset(stream)
+    ijson = backend()
+    if ijson is None:
+        content = json.load(fileobj)
+        if root and content.get(root):
+            content = content[root]
+        for key, value in content.items():
+            if key in stream and isinstance(value, list):
+                for item in value:
+                    yield key, item
+            else:
+                yield key, value
+        return
+    yield from _iter_events(
+        ijson.parse(fileobj, use_float=True), ijson.common.ObjectBuilder, root, stream
+    )
+
+
+def _iter_events(events, builder_class, root, stream):
+    """
+    Builds fields from ijson parse events
+
+    Args:
+        events(iterator): of tuple (prefix, event, value)
+        builder_class(type): ijson ObjectBuilder
+        root(str): key wrapping resource
+        stream(frozenset): keys of arrays to yield item by item
+
+    Returns:
+        iterator of tuple (key, value)
+
+    """
+    base = ""
+    key = path = streaming = builder = None
+    depth = 0
+    for prefix, event, value in events:
+        # inside a value being built
+        if builder is not None:
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            if not depth:
+                yield key, builder.value
+                builder = None
+            continue
+
+        if prefix == base and event == "map_key":
+            key = value
+            path = f"{base}.{key}" if base else key
+        elif streaming:
+            if event == "end_array" and prefix == path:
+                streaming = None
+            elif event in ("start_map", "start_array"):
+                builder = builder_class()
+                builder.event(event, value)
+                depth = 1
+            else:
+                yield key, value
+        elif prefix == path:
+            if event == "start_map" and not base and key == root:
+                base = root
+            elif event == "start_array" and key in stream:
+                streaming = key
+            elif event in ("start_map", "start_array"):
+                builder = builder_class()
+                builder.event(event, value)
+                depth = 1
+            else:
+                yield key, value
+
+
+if __name__ == "__main__":
+    pass
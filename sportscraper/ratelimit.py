@@ -0,0 +1,233 @@
+"""
+ratelimit.py
+
+Per-host token-bucket rate limiting shared by scrapers in the same process
+
+"""
+
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+# (requests per second, burst) for hosts we scrape regularly
+HOST_LIMITS = {
+    "api.playdraft.com": (0.5, 4),
+    "api.draftkings.com": (1.0, 5),
+    "fantasysports.yahooapis.com": (1.0, 5),
+}
+
+_BUCKETS = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Token bucket that refills at a fixed rate up to burst tokens
+
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        Creates bucket that starts full
+
+        Args:
+            rate(float): tokens added per second
+            burst(int): maximum tokens held, i.e. requests allowed back-to-back
+
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes one token, going into debt if the bucket is empty
+
+        Returns:
+            float: seconds caller must wait before using the token
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """
+        Takes one token, sleeping until it is available
+
+        Returns:
+            float: seconds waited
+
+        """
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+def shared_bucket(host, rate, burst):
+    """
+    Gets process-wide bucket, so scrapers with same settings share one budget
+
+    Args:
+        host(str): e.g. 'api.playdraft.com'
+        rate(float): tokens per second
+        burst(int): bucket size
+
+    Returns:
+        TokenBucket
+
+    """
+    key = (host, rate, burst)
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(key)
+        if not bucket:
+            bucket = TokenBucket(rate, burst)
+            _BUCKETS[key] = bucket
+        return bucket
+
+
+class RateLimiter:
+    """
+    Per-host rate limiter. Buckets are shared across instances in the process.
+
+    Usage:
+        limiter = RateLimiter(rate=0.5, burst=2)
+        limiter.wait('https://api.playdraft.com/v1/clustered_complete_contests')
+
+    """
+
+    def __init__(self, rate=0.5, burst=1, host_limits=None):
+        """
+        Creates rate limiter
+
+        Args:
+            rate(float): default requests per second for hosts not in host_limits
+            burst(int): default burst for hosts not in host_limits
+            host_limits(dict): host: (rate, burst), default HOST_LIMITS
+
+        """
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.rate = rate
+        self.burst = burst
+        self.host_limits = dict(HOST_LIMITS if host_limits is None else host_limits)
+
+    @classmethod
+    def from_delay(cls, delay, **kwargs):
+        """
+        Creates limiter equivalent to sleeping delay seconds between requests.
+        delay applies to every host, HOST_LIMITS are not used.
+
+        Args:
+            delay(float): seconds between requests
+            **kwargs: passed to RateLimiter
+
+        Returns:
+            RateLimiter
+
+        """
+        kwargs.setdefault("host_limits", {})
+        return cls(rate=1.0 / delay, **kwargs)
+
+    def bucket(self, url):
+        """
+        Gets bucket for host of url
+
+        Args:
+            url(str): url or bare host
+
+        Returns:
+            TokenBucket
+
+        """
+        host = urlsplit(url).netloc or url
+        rate, burst = self.host_limits.get(host, (self.rate, self.burst))
+        return shared_bucket(host, rate, burst)
+
+    def reserve(self, url):
+        """
+        Takes token for host without blocking, for use in event loops
+
+        Args:
+            url(str):
+
+        Returns:
+            float: seconds to wait
+
+        """
+        return self.bucket(url).reserve()
+
+    def wait(self, url):
+        """
+        Blocks until host has token available
+
+        Args:
+            url(str):
+
+        Returns:
+            float: seconds waited
+
+        """
+        waited = self.bucket(url).acquire()
+        if waited:
+            logging.debug("rate limited %s for %.2f s", url, waited)
+        return waited
+
+
+class ThrottledAdapter:
+    """
+    Transport adapter that waits for host rate limit before sending each
+    request. CacheAdapter wraps it, so only requests that reach the network
+    wait.
+
+    """
+
+    def __init__(self, adapter, rate_limiter):
+        """
+        Wraps transport adapter
+
+        Args:
+            adapter(BaseAdapter): adapter that does network i/o
+            rate_limiter(RateLimiter):
+
+        """
+        self.adapter = adapter
+        self.rate_limiter = rate_limiter
+
+    def send(self, request, **kwargs):
+        """
+        Waits for token, then sends PreparedRequest
+
+        Args:
+            request(PreparedRequest):
+            **kwargs: passed to wrapped adapter
+
+        Returns:
+            Response
+
+        """
+        self.rate_limiter.wait(request.url)
+        return self.adapter.send(request, **kwargs)
+
+    def close(self):
+        """
+        Closes wrapped adapter
+
+        """
+        self.adapter.close()
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,249 @@
+"""
+retry.py
+
+Retry policy with exponential backoff and per-host circuit breakers
+
+"""
+
+import datetime
+import logging
+import random
+import threading
+import time
+
+
+# statuses worth retrying, 429 and 503 usually come with Retry-After
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# methods safe to repeat if the server may have processed the first attempt
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+_BREAKERS = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request to a host whose circuit is open
+
+    """
+
+    def __init__(self, host, retry_in):
+        """
+
+        Args:
+            host(str):
+            retry_in(float): seconds until circuit allows a trial request
+
+        """
+        super().__init__(f"circuit open for {host}, retry in {retry_in:.0f} s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """
+    Decides whether and how long to wait before retrying a request
+
+    """
+
+    def __init__(
+        self,
+        retries=3,
+        backoff=1.0,
+        max_backoff=60.0,
+        max_retry_after=300.0,
+        statuses=RETRY_STATUSES,
+    ):
+        """
+        Creates policy
+
+        Args:
+            retries(int): retries after first attempt, default 3
+            backoff(float): base seconds, doubled each attempt, default 1
+            max_backoff(float): cap on computed backoff, default 60
+            max_retry_after(float): cap on server Retry-After, default 300
+            statuses(frozenset): HTTP statuses to retry
+
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.statuses = frozenset(statuses)
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Parses Retry-After header
+
+        Args:
+            value(str): seconds or HTTP date
+
+        Returns:
+            float: seconds, None if missing or invalid
+
+        """
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        from email.utils import parsedate_to_datetime
+
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        now = datetime.datetime.now(when.tzinfo)
+        return max((when - now).total_seconds(), 0.0)
+
+    def wait_time(self, attempt, retry_after=None):
+        """
+        Seconds to wait before next attempt, jittered between half and all of
+        the backoff unless server says otherwise
+
+        Args:
+            attempt(int): 0 for first retry
+            retry_after(str): Retry-After header
+
+        Returns:
+            float
+
+        """
+        seconds = self.parse_retry_after(retry_after)
+        if seconds is not None:
+            return min(seconds, self.max_retry_after)
+        # floor keeps a 429 or 503 without Retry-After from retrying at once
+        backoff = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(backoff / 2, backoff)
+
+    def should_retry(
+        self, method, attempt, status=None, retry_after=None, idempotent=None
+    ):
+        """
+        Tests if request should be retried
+
+        Non-idempotent requests (e.g. POST) are only retried on 429 with
+        Retry-After, where the server says it rejected the request unprocessed.
+
+        Args:
+            method(str): 'GET', 'POST', etc.
+            attempt(int): retries already made
+            status(int): HTTP status, None for connection error
+            retry_after(str): Retry-After header
+            idempotent(bool): override method-based idempotency
+
+        Returns:
+            bool
+
+        """
+        if attempt >= self.retries:
+            return False
+        if status is not None and status not in self.statuses:
+            return False
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if idempotent:
+            return True
+        return status == 429 and retry_after is not None
+
+
+class CircuitBreaker:
+    """
+    Stops requests to a failing host, then lets one trial request through
+    after reset_timeout seconds
+
+    """
+
+    def __init__(self, host, failure_threshold=5, reset_timeout=60.0):
+        """
+        Creates closed circuit
+
+        Args:
+            host(str):
+            failure_threshold(int): consecutive failures that open circuit
+            reset_timeout(float): seconds circuit stays open
+
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """
+        'closed', 'open' or 'half-open'
+
+        """
+        if self.opened is None:
+            return "closed"
+        if time.monotonic() - self.opened < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def check(self):
+        """
+        Raises if circuit is open
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            if self.state == "open":
+                retry_in = self.reset_timeout - (time.monotonic() - self.opened)
+                raise CircuitOpenError(self.host, retry_in)
+            if self.state == "half-open":
+                # one trial request, circuit stays open for everyone else
+                self.opened = time.monotonic()
+
+    def record_success(self):
+        """
+        Closes circuit
+
+        """
+        with self._lock:
+            self.failures = 0
+            self.opened = None
+
+    def record_failure(self):
+        """
+        Counts failure, opening circuit at threshold
+
+        """
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self.opened is None:
+                    logging.warning("opening circuit for %s", self.host)
+                self.opened = time.monotonic()
+
+
+def shared_breaker(host, failure_threshold=5, reset_timeout=60.0):
+    """
+    Gets process-wide circuit breaker for host
+
+    Args:
+        host(str):
+        failure_threshold(int): used when breaker is created
+        reset_timeout(float): used when breaker is created
+
+    Returns:
+        CircuitBreaker
+
+    """
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(host)
+        if not breaker:
+            breaker = CircuitBreaker(host, failure_threshold, reset_timeout)
+            _BREAKERS[host] = breaker
+        return breaker
+
+
+if __name__ == "__main__":
+    pass
@@ -4,40 +4,27 @@ Scraper classes for use in nfl, nba, etc.
 
 """
 
+import codecs
+from collections import Counter
+import atexit
+import bisect
 import datetime
-import hashlib
+import io
 import json
 import logging
 import os
-import psutil
 import random
 import re
 import time
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlsplit
+import weakref
 
-from requests_html import HTMLSession
-
-try:
-    from pyvirtualdisplay import Display
-except ImportError:
-    pass
-
-try:
-    from selenium import webdriver
-except ImportError:
-    pass
-
-try:
-    from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
-    from selenium.webdriver.remote.errorhandler import WebDriverException
-    from selenium.common.exceptions import (
-        TimeoutException,
-        InsecureCertificateException,
-    )
-except ImportError:
-    pass
-
-from .utility import random_string
+from . import dates
+from .cache import FileCache, ResponseCache, atomic_write, cache_path
+from .jsonstream import IterReader, iter_resource
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, shared_breaker
+from .transport import shared_transport
 
 
 USER_AGENTS = (
@@ -64,23 +51,88 @@ USER_AGENTS = (
 )
 
 
+# heavy dependencies (requests_html, aiohttp, asyncio, selenium, pyvirtualdisplay,
+# psutil) are imported when a scraper is used, so parsers import quickly
+
+
+# resources browsers skip by default, they are not needed to read page data
+BLOCK_RESOURCES = ("images", "fonts", "css")
+
+FIREFOX_BLOCK_PREFS = {
+    "images": {"permissions.default.image": 2},
+    "fonts": {
+        "gfx.downloadable_fonts.enabled": False,
+        "browser.display.use_document_fonts": 0,
+    },
+    "css": {"permissions.default.stylesheet": 2},
+}
+
+CHROME_BLOCK_PREFS = {
+    "images": {"profile.managed_default_content_settings.images": 2},
+    "fonts": {},
+    "css": {"profile.managed_default_content_settings.stylesheets": 2},
+}
+
+# browsers still open, closed at exit if their owners did not
+_BROWSERS = weakref.WeakSet()
+
+
+def _reap_browsers():
+    """
+    Closes browsers still open at interpreter exit
+
+    """
+    for scraper in list(_BROWSERS):
+        scraper.close()
+
+
+atexit.register(_reap_browsers)
+
+
 class RequestScraper:
     """
-    Base class for scraping using requests_html session
+    Base class for scraping using requests session
 
     """
 
     def __init__(self, **kwargs):
         """
+        Creates scraper
+
+        Args:
+            **kwargs: delay, rate_limiter, expire_hours, retry, cookies, headers,
+                proxies, cache_name, cache, host_ttls, transport, html
+
         """
         logging.getLogger(__name__).addHandler(logging.NullHandler())
         self.urls = []
+        self.provenance = []
+        self.stats = Counter()
+        self._filecaches = {}
 
-        # use requests HTML to aid parsing
-        # has all same methods as requests.Session
-        _s = HTMLSession()
+        # plain requests.Session is enough for JSON / XML / CSV apis
+        # html=True uses requests_html.HTMLSession, which adds resp.html parsing
+        if kwargs.get("html"):
+            from requests_html import HTMLSession
+
+            _s = HTMLSession()
+        else:
+            import requests
+
+            _s = requests.Session()
+        # default delay uses HOST_LIMITS, an explicit delay applies to every host
         self.delay = kwargs.get("delay", 2)
+        if "rate_limiter" in kwargs:
+            self.rate_limiter = kwargs["rate_limiter"]
+        elif not self.delay:
+            self.rate_limiter = None
+        elif "delay" in kwargs:
+            self.rate_limiter = RateLimiter.from_delay(self.delay)
+        else:
+            self.rate_limiter = RateLimiter(rate=1.0 / self.delay)
         self.expire_hours = kwargs.get("expire_hours", 168)
+        # retry=None disables retries and circuit breakers
+        self.retry = kwargs.get("retry", RetryPolicy())
 
         # add cookies
         if kwargs.get("cookies"):
@@ -106,33 +158,22 @@ class RequestScraper:
             _s.proxies = kwargs["proxies"]
 
         # add cache
-        if not kwargs.get("cache_name"):
-            self.cache_name = os.path.join("/tmp", random_string(32))
-        elif "/" not in kwargs.get("cache_name", ""):
-            self.cache_name = os.path.join("/tmp", kwargs["cache_name"])
+        # cache=False disables caching, cache=ResponseCache(...) shares one cache
+        self.cache_name = cache_path(kwargs.get("cache_name"))
+        if kwargs.get("cache") is False:
+            self.cache = None
+        elif kwargs.get("cache") is not None:
+            self.cache = kwargs["cache"]
         else:
-            self.cache_name = kwargs.get("cache_name")
-
-        try:
-            from cachecontrol import CacheControlAdapter
-            from cachecontrol.heuristics import ExpiresAfter
-            from cachecontrol.caches import FileCache
-
-            _s.mount(
-                "http://",
-                CacheControlAdapter(
-                    cache=FileCache(self.cache_name),
-                    cache_etags=False,
-                    heuristic=ExpiresAfter(hours=self.expire_hours),
-                ),
+            self.cache = ResponseCache(
+                self.cache_name,
+                expire_hours=self.expire_hours,
+                host_ttls=kwargs.get("host_ttls"),
             )
-        except ImportError:
-            try:
-                import requests_cache
 
-                requests_cache.install_cache(self.cache_name)
-            except BaseException:
-                logging.exception("could not install cache")
+        # connection pools are shared with every scraper using the same transport
+        self.transport = kwargs.get("transport") or shared_transport()
+        self.transport.mount(_s, self.cache, self.rate_limiter)
         self.session = _s
 
     @property
@@ -154,8 +195,167 @@ class RequestScraper:
         """
         self.session.headers.update(value)
 
+    @staticmethod
+    def _provenance(resp):
+        """
+        Determines where response came from
+
+        Args:
+            resp(Response):
+
+        Returns:
+            str: 'cache', 'revalidated' or 'network'
+
+        """
+        if getattr(resp, "revalidated", False) or resp.status_code == 304:
+            return "revalidated"
+        if getattr(resp, "from_cache", False):
+            return "cache"
+        return "network"
+
+    def _count(self, url, source, nbytes=0):
+        """
+        Records url, provenance and counters
+
+        Args:
+            url(str):
+            source(str): 'cache', 'revalidated' or 'network'
+            nbytes(int): bytes received over network
+
+        Returns:
+            None
+
+        """
+        self.urls.append(url)
+        self.provenance.append((url, source))
+        if source == "cache":
+            self.stats["hits"] += 1
+        elif source == "revalidated":
+            self.stats["revalidations"] += 1
+        else:
+            self.stats["misses"] += 1
+            self.stats["bytes"] += nbytes
+
+    def _record(self, resp, nbytes=None):
+        """
+        Records url, provenance and counters
+
+        Args:
+            resp(Response):
+            nbytes(int): bytes received, default is length of body
+
+        Returns:
+            str: provenance of response
+
+        """
+        source = self._provenance(resp)
+        resp.provenance = source
+        if nbytes is None:
+            nbytes = len(resp.content) if source == "network" else 0
+        self._count(resp.url, source, nbytes)
+        return source
+
+    def _request(self, method, url, idempotent=None, **kwargs):
+        """
+        Sends request, retrying transient failures with backoff
+
+        Args:
+            method(str): 'GET', 'POST', etc.
+            url(str):
+            idempotent(bool): safe to repeat, default based on method
+            **kwargs: passed to session.request
+
+        Returns:
+            Response
+
+        Raises:
+            CircuitOpenError: host has failed repeatedly, request not sent
+
+        """
+        from requests.exceptions import ConnectionError, Timeout
+
+        if not self.retry:
+            return self.session.request(method, url, **kwargs)
+        breaker = shared_breaker(urlsplit(url).netloc)
+        attempt = 0
+        while True:
+            breaker.check()
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (ConnectionError, Timeout) as err:
+                breaker.record_failure()
+                if not self.retry.should_retry(method, attempt, idempotent=idempotent):
+                    raise
+                wait = self.retry.wait_time(attempt)
+                logging.warning("%s, retrying %s in %.1f s", err, url, wait)
+            else:
+                if resp.status_code not in self.retry.statuses:
+                    breaker.record_success()
+                    return resp
+                breaker.record_failure()
+                retry_after = resp.headers.get("Retry-After")
+                if not self.retry.should_retry(
+                    method, attempt, resp.status_code, retry_after, idempotent
+                ):
+                    return resp
+                wait = self.retry.wait_time(attempt, retry_after)
+                logging.warning(
+                    "status %s, retrying %s in %.1f s", resp.status_code, url, wait
+                )
+                resp.close()
+            time.sleep(wait)
+            attempt += 1
+
+    def cache_stats(self):
+        """
+        Counts of cache hits, misses, revalidations and network bytes this run
+
+        Returns:
+            dict
+
+        """
+        stats = dict(self.stats)
+        for k in ("hits", "misses", "revalidations", "bytes"):
+            stats.setdefault(k, 0)
+        total = stats["hits"] + stats["misses"] + stats["revalidations"]
+        stats["hit_rate"] = round(stats["hits"] / total, 3) if total else 0.0
+        return stats
+
+    def expire(self, url, params=None):
+        """
+        Marks cached response for url stale, so next get revalidates it, e.g.
+        for listings that change between runs
+
+        Args:
+            url(str):
+            params(dict): url parameters
+
+        Returns:
+            None
+
+        """
+        if self.cache is not None:
+            self.cache.expire(self.cache.key("GET", url, params, self.session.headers))
+
+    def reset_stats(self):
+        """
+        Clears provenance and counters, e.g. at start of a new run
+
+        Returns:
+            None
+
+        """
+        self.provenance = []
+        self.stats = Counter()
+
     def get(
-        self, url, params=None, headers=None, encoding="utf-8", return_object=False
+        self,
+        url,
+        params=None,
+        headers=None,
+        encoding="utf-8",
+        return_object=False,
+        stream=False,
     ):
         """
         Args:
@@ -164,59 +364,206 @@ class RequestScraper:
             headers(dict): header dict
             encoding(str): default utf-8
             include_object(bool):
+            stream(bool): return iterator of lines rather than str
 
         Returns:
-            str
+            str, or iterator of str if stream
 
         """
+        if stream:
+            return self.get_stream(
+                url, params=params, headers=headers, encoding=encoding
+            )
+
         if headers:
             self.session.headers.update(headers)
 
         if params:
-            resp = self.session.get(
-                url, params={k: params[k] for k in sorted(params)}, headers=self.headers
+            resp = self._request(
+                "GET",
+                url,
+                params={k: params[k] for k in sorted(params)},
+                headers=self.headers,
             )
         else:
-            resp = self.session.get(url, headers=self.headers)
-        self.urls.append(resp.url)
+            resp = self._request("GET", url, headers=self.headers)
+        self._record(resp)
         resp.raise_for_status()
         if resp.status_code == 304:
-            resp = self.session.get(url, headers=self.headers)
-        if self.delay:
-            time.sleep(self.delay)
+            resp = self._request("GET", url, headers=self.headers)
+            self._record(resp)
         if return_object:
             return resp
         return resp.content.decode(encoding)
 
-    def get_filecache(self, url, savedir="/tmp", encoding="utf-8"):
+    def get_stream(
+        self,
+        url,
+        params=None,
+        headers=None,
+        encoding="utf-8",
+        lines=True,
+        chunk_size=64 * 1024,
+        file_name=None,
+    ):
         """
-        Uses file-based caching, helpful for debugging because can look at files
+        Gets resource with bounded memory, e.g. large csv files
 
         Args:
             url(str):
-            savedir(str):
-            encoding(str):
+            params(dict): url parameters
+            headers(dict): header dict
+            encoding(str): default utf-8
+            lines(bool): yield lines (with line endings) rather than chunks
+            chunk_size(int): bytes read at a time
+            file_name(str): write raw bytes to file instead of decoding
 
         Returns:
-            str
+            iterator of str, or int bytes written if file_name
 
         """
-        file_name = os.path.join(
-            savedir, "{}.html".format(hashlib.md5(url).hexdigest())
+        if headers:
+            self.session.headers.update(headers)
+        if params:
+            params = {k: params[k] for k in sorted(params)}
+        resp = self._request(
+            "GET", url, params=params, headers=self.headers, stream=True
         )
-        if os.path.exists(file_name):
-            with open(file_name, "rb") as infile:
-                content = infile.read()
+        self._record(resp, nbytes=0)
+        resp.raise_for_status()
+        if not file_name:
+            return self._iter_decoded(resp, encoding, lines, chunk_size)
+
+        size = 0
+
+        def _write(outfile):
+            nonlocal size
+            for chunk in self._iter_chunks(resp, chunk_size):
+                outfile.write(chunk)
+                size += len(chunk)
+
+        with resp:
+            atomic_write(file_name, _write)
+        return size
+
+    def _iter_chunks(self, resp, chunk_size):
+        """
+        Reads response body in chunks, counting network bytes
+
+        Args:
+            resp(Response): opened with stream=True
+            chunk_size(int):
+
+        Returns:
+            iterator of bytes
+
+        """
+        network = resp.provenance == "network"
+        for chunk in resp.iter_content(chunk_size=chunk_size):
+            if network:
+                self.stats["bytes"] += len(chunk)
+            yield chunk
+
+    def _iter_decoded(self, resp, encoding, lines, chunk_size):
+        """
+        Decodes streamed response incrementally
+
+        Args:
+            resp(Response): opened with stream=True
+            encoding(str):
+            lines(bool): yield lines rather than chunks
+            chunk_size(int):
+
+        Returns:
+            iterator of str
+
+        """
+        decoder = codecs.getincrementaldecoder(encoding)()
+        pending = ""
+        with resp:
+            for chunk in self._iter_chunks(resp, chunk_size):
+                text = decoder.decode(chunk)
+                if not lines:
+                    if text:
+                        yield text
+                    continue
+                # split on \n only, same as iterating over io.StringIO
+                buf = pending + text
+                start = buf.find("\n") + 1
+                end = 0
+                while start:
+                    yield buf[end:start]
+                    end = start
+                    start = buf.find("\n", end) + 1
+                pending = buf[end:]
+            text = pending + decoder.decode(b"", final=True)
+            if text:
+                yield text
+
+    def get_filecache(
+        self,
+        url,
+        params=None,
+        savedir=None,
+        encoding="utf-8",
+        as_bytes=False,
+        stream=False,
+    ):
+        """
+        Uses file-based caching, helpful for debugging because can look at files.
+        Body is streamed to a gzipped file, never held twice in memory.
+
+        Args:
+            url(str):
+            params(dict): url parameters
+            savedir(str): default FileCache directory
+            encoding(str): default utf-8
+            as_bytes(bool): return bytes rather than str
+            stream(bool): return open file of cached body, caller closes it
+
+        Returns:
+            str or bytes, file object if stream
+
+        """
+        cache = self._filecache(savedir)
+        key = cache.key(url, params)
+        if cache.fresh(key):
+            self._count(url, "cache")
         else:
-            resp = self.session.get(url)
-            self.urls.append(resp.url)
+            if params:
+                params = {k: params[k] for k in sorted(params)}
+            resp = self._request("GET", url, params=params, stream=True)
+            self._record(resp, nbytes=0)
             resp.raise_for_status()
-            content = resp.content.decode(encoding)
-            with open(file_name, "wb") as outfile:
-                outfile.write(content)
-            if self.delay:
-                time.sleep(self.delay)
-        return content
+            with resp:
+                cache.set(
+                    key,
+                    resp.url,
+                    self._iter_chunks(resp, 64 * 1024),
+                    content_type=resp.headers.get("Content-Type"),
+                )
+        # body was just checked or written, so expiring since must not lose it
+        if stream:
+            infile = cache.open(key, stale=True)
+            if as_bytes:
+                return infile
+            return io.TextIOWrapper(infile, encoding=encoding, newline="")
+        return cache.get(key, encoding=None if as_bytes else encoding, stale=True)
+
+    def _filecache(self, savedir=None):
+        """
+        Gets FileCache for directory, creating it once per scraper
+
+        Args:
+            savedir(str): None for default directory
+
+        Returns:
+            FileCache
+
+        """
+        if savedir not in self._filecaches:
+            self._filecaches[savedir] = FileCache(savedir, self.expire_hours)
+        return self._filecaches[savedir]
 
     def get_json(self, url, headers=None, payload=None):
         """
@@ -234,19 +581,72 @@ class RequestScraper:
             self.session.headers.update(headers)
 
         if payload:
-            resp = self.session.get(
+            resp = self._request(
+                "GET",
                 url,
                 headers=self.headers,
                 params={k: payload[k] for k in sorted(payload)},
             )
         else:
-            resp = self.session.get(url, headers=self.headers, params=None)
-        self.urls.append(resp.url)
+            resp = self._request("GET", url, headers=self.headers)
+        self._record(resp)
         resp.raise_for_status()
-        if self.delay:
-            time.sleep(self.delay)
         return resp.json()
 
+    def get_json_stream(
+        self,
+        url,
+        root=None,
+        stream=(),
+        params=None,
+        headers=None,
+        chunk_size=64 * 1024,
+    ):
+        """
+        Gets JSON resource and parses it as it arrives, see
+        jsonstream.iter_resource. Streamed responses are not stored in cache.
+
+        Args:
+            url(str):
+            root(str): key wrapping resource, e.g. 'draft'
+            stream(iterable): keys of arrays to yield item by item
+            params(dict): url parameters
+            headers(dict): header dict
+            chunk_size(int): bytes read at a time
+
+        Returns:
+            iterator of tuple (key, value)
+
+        """
+        if headers:
+            self.session.headers.update(headers)
+        if params:
+            params = {k: params[k] for k in sorted(params)}
+        resp = self._request(
+            "GET", url, params=params, headers=self.headers, stream=True
+        )
+        self._record(resp, nbytes=0)
+        resp.raise_for_status()
+        return self._iter_json(resp, root, stream, chunk_size)
+
+    def _iter_json(self, resp, root, stream, chunk_size):
+        """
+        Parses streamed response incrementally
+
+        Args:
+            resp(Response): opened with stream=True
+            root(str):
+            stream(iterable):
+            chunk_size(int):
+
+        Returns:
+            iterator of tuple (key, value)
+
+        """
+        with resp:
+            reader = IterReader(self._iter_chunks(resp, chunk_size))
+            yield from iter_resource(reader, root=root, stream=stream)
+
     def get_tor(self, url):
         """
         Makes request over TOR network
@@ -264,14 +664,16 @@ class RequestScraper:
             logging.exception("could not get over tor %s", url)
             return self.get(url)
 
-    def post(self, url, data, headers=None, params=None):
+    def post(self, url, data, headers=None, params=None, idempotent=False):
         """
+        Posts data. Not retried on server errors unless idempotent.
 
         Args:
             url (str): url for post
             data (dict): data to post
             headers (dict): HTTP headers
             params (str): key-value URL parameters
+            idempotent (bool): safe to repeat, default False
 
         Returns:
             HTTPResponse
@@ -279,290 +681,944 @@ class RequestScraper:
         """
         if headers:
             self.session.headers.update(headers)
-        resp = self.session.post(url, data, headers=self.headers, params=params)
-        self.urls.append(resp.url)
+        resp = self._request(
+            "POST",
+            url,
+            idempotent=idempotent,
+            data=data,
+            headers=self.headers,
+            params=params,
+        )
+        self._record(resp)
         resp.raise_for_status()
-        if self.delay:
-            time.sleep(self.delay)
         return resp
 
 
-class BrowserScraper:
+class AsyncRequestScraper(RequestScraper):
     """
-    Scraper using selenium
+    Concurrent scraper using asyncio and aiohttp. Subclass of RequestScraper.
+
+    Usage:
+        s = AsyncRequestScraper(concurrency=8, delay=1)
+        contests = s.get_json_many(urls)
 
     """
 
-    def __init__(self, profile, visible=False, cache_dir=None):
+    def __init__(self, concurrency=8, per_host=4, **kwargs):
         """
-        Scraper using selenium
+        Scraper that keeps multiple requests in flight
 
         Args:
-            profile(str): path to firefox profile
-            visible(bool): show browser, use virtual display if False
-            cache_dir(str): default /tmp
+            concurrency(int): maximum requests in flight, default 8
+            per_host(int): maximum connections to a single host, default 4
+            **kwargs: passed to RequestScraper
 
         """
-        logging.getLogger(__name__).addHandler(logging.NullHandler())
-        self.urls = []
-        self.cachedir = cache_dir
-
-        if not visible:
-            self.display = Display(visible=0, size=(800, 600))
-            self.display.start()
-
-        caps = DesiredCapabilities.FIREFOX.copy()
-        caps["marionette"] = True
-        if profile:
-            self.browser = webdriver.Firefox(
-                capabilities=caps, firefox_profile=profile, log_path=os.devnull
-            )
-        else:
-            self.browser = webdriver.Firefox(capabilities=caps, log_path=os.devnull)
-        self.browser.set_page_load_timeout(30)
+        RequestScraper.__init__(self, **kwargs)
+        self.concurrency = concurrency
+        self.per_host = per_host
 
-    def __del__(self):
+    def _cookie_jar(self):
         """
-        Clean up zombie processes
+        Copies self.session cookies into aiohttp cookie jar, keeping domains
+        so each cookie is only sent to the hosts it was set for
 
-        """
-        procnames = ["Xvfb", "geckodriver"]
-        try:
-            for proc in psutil.process_iter():
-                # check whether the process name matches
-                if proc.name() in procnames:
-                    proc.kill()
-        except:
-            pass
+        Returns:
+            aiohttp.CookieJar
 
-    def get(self, url, payload=None):
         """
-        Gets page using headless firefox
+        from http.cookies import SimpleCookie
+
+        import aiohttp
+        from yarl import URL
+
+        jar = aiohttp.CookieJar()
+        for c in self.session.cookies:
+            if not c.domain:
+                # like requests, a cookie without domain goes to every host
+                jar.update_cookies({c.name: c.value})
+                continue
+            cookie = SimpleCookie()
+            cookie[c.name] = c.value
+            morsel = cookie[c.name]
+            morsel["path"] = c.path or "/"
+            if c.domain.startswith("."):
+                morsel["domain"] = c.domain
+            if c.secure:
+                morsel["secure"] = True
+            jar.update_cookies(cookie, URL(f"https://{c.domain.lstrip('.')}/"))
+        return jar
+
+    def _proxy(self, url):
+        """
+        Proxy from self.session.proxies for url, aiohttp takes one per request
 
         Args:
-            url: string
+            url(str):
 
         Returns:
-            string of HTML
-        """
-        if payload:
-            url = f"{url}?{urlencode(payload)}"
-        self.urls.append(url)
-        if self.cachedir:
-            url_hash = hashlib.md5(url.encode("utf-8")).hexdigest()
-            file_name = os.path.join(self.cachedir, f"{url_hash}.html")
-            if os.path.exists(file_name):
-                with open(file_name, "rb") as infile:
-                    return infile.read()
-        try:
-            self.browser.get(url)
-        except (InsecureCertificateException, BrokenPipeError, TimeoutException):
-            time.sleep(1)
-            self.browser.get(url)
-        return self.browser.page_source
+            str or None
 
-    def get_json(self, url, payload=None):
         """
+        proxies = self.session.proxies or {}
+        return proxies.get(urlsplit(url).scheme) or proxies.get("all")
 
-        Args:
-            url:
+    def _client(self):
+        """
+        Creates aiohttp session with same headers and cookies as self.session
 
         Returns:
-            dict parsed json
+            aiohttp.ClientSession
+
         """
-        if payload:
-            url = "{}?{}".format(url, urlencode(payload))
-        self.urls.append(url)
-        if self.cachedir:
-            url_hash = hashlib.md5(url.encode("utf-8")).hexdigest()
-            file_name = os.path.join(self.cachedir, f"{url_hash}.html")
-            if os.path.exists(file_name):
-                with open(file_name, "rb") as infile:
-                    return infile.read()
-        self.browser.get(url)
-        content = self.browser.find_element_by_tag_name("body").text
-        return json.loads(content)
+        import aiohttp
 
-    def get_jsvar(self, varname):
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency, limit_per_host=self.per_host
+        )
+        # let aiohttp negotiate encodings it can actually decode
+        headers = {
+            k: v
+            for k, v in self.session.headers.items()
+            if k.lower() != "accept-encoding"
+        }
+        return aiohttp.ClientSession(
+            connector=connector, headers=headers, cookie_jar=self._cookie_jar()
+        )
+
+    async def _polite(self, url):
         """
-        Gets python data structure of javascript variable
+        Waits for host rate limit without blocking the event loop
 
         Args:
-            varname (str): name of javascript variable
+            url(str):
 
         Returns:
-            whatever the type of the javascript variable
+            None
 
         """
-        try:
-            return self.browser.execute_script("return {};".format(varname))
-        except WebDriverException as err:
-            logging.exception(err)
-            return None
+        import asyncio
 
-    def requests(self, dump=True):
+        if self.rate_limiter:
+            wait = self.rate_limiter.reserve(url)
+            if wait:
+                await asyncio.sleep(wait)
+
+    @staticmethod
+    def _decode(body, encoding, as_json):
         """
-        Retrieves and dumps request information
+        Decodes response body
 
         Args:
-            dump(bool): print request information
+            body(bytes):
+            encoding(str):
+            as_json(bool): parse as JSON
 
         Returns:
-            list
+            str or dict
 
         """
-        responses = []
-        for request in self.browser.requests:
-            if request.response:
-                responses.append(request.response)
-                if dump:
-                    print(
-                        request.path,
-                        request.response.status_code,
-                        request.response.headers["Content-Type"],
-                    )
-        return responses
-
+        if as_json:
+            return json.loads(body)
+        return body.decode(encoding)
 
-class WaybackScraper(RequestScraper):
-    """
-    Scraper for wayback machine. Subclass of RequestScraper.
+    async def _fetch(self, client, semaphore, url, params, encoding, as_json):
+        """
+        Fetches single url, using same cache as synchronous methods
 
-    """
+        Args:
+            client(aiohttp.ClientSession):
+            semaphore(asyncio.Semaphore):
+            url(str):
+            params(dict): url parameters
+            encoding(str):
+            as_json(bool): parse response as JSON
 
-    def __init__(self, **kwargs):
-        """
-        Scraper for waybackmachine API
+        Returns:
+            str or dict
 
         """
-        RequestScraper.__init__(self, **kwargs)
-        self.wburl = "http://archive.org/wayback/available?url={}&timestamp={}"
+        import asyncio
+        import aiohttp
 
-    @staticmethod
-    def convert_format(datestr, site):
+        if params:
+            params = {k: params[k] for k in sorted(params)}
+        key = cached = None
+        headers = {}
+        if self.cache is not None:
+            key = self.cache.key("GET", url, params, self.session.headers)
+            cached = self.cache.get(key)
+            if self.cache.fresh(cached):
+                self._count(cached.url, "cache")
+                return self._decode(cached.body, encoding, as_json)
+            if cached and cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached and cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        breaker = shared_breaker(urlsplit(url).netloc) if self.retry else None
+        attempt = 0
+        while True:
+            if breaker:
+                breaker.check()
+            wait = None
+            try:
+                async with semaphore:
+                    await self._polite(url)
+                    async with client.get(
+                        url, params=params, headers=headers, proxy=self._proxy(url)
+                    ) as resp:
+                        resp_url = str(resp.url)
+                        retry_after = resp.headers.get("Retry-After")
+                        if breaker and resp.status in self.retry.statuses:
+                            breaker.record_failure()
+                            if self.retry.should_retry(
+                                "GET", attempt, resp.status, retry_after
+                            ):
+                                wait = self.retry.wait_time(attempt, retry_after)
+                        elif breaker:
+                            breaker.record_success()
+                        if wait is None:
+                            if resp.status == 304 and cached:
+                                self.cache.refresh(key, resp_url)
+                                self._count(resp_url, "revalidated")
+                                return self._decode(cached.body, encoding, as_json)
+                            resp.raise_for_status()
+                            body = await resp.read()
+                            self._count(resp_url, "network", len(body))
+                            if self.cache is not None and resp.status == 200:
+                                self.cache.set(
+                                    key, "GET", resp_url, 200, resp.headers, body
+                                )
+                            return self._decode(body, encoding, as_json)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                if not breaker:
+                    raise
+                breaker.record_failure()
+                if not self.retry.should_retry("GET", attempt):
+                    raise
+                wait = self.retry.wait_time(attempt)
+                logging.warning("%s, retrying %s in %.1f s", err, url, wait)
+            else:
+                logging.warning(
+                    "status %s, retrying %s in %.1f s", resp.status, url, wait
+                )
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    async def _gather(self, urls, params, encoding, as_json, return_exceptions):
         """
-        Converts string from one date format to another
+        Fetches all urls, results are in same order as urls
 
         Args:
-            datestr(str): date as string
-            site(str): 'nfl', 'fl', 'std', etc.
+            urls(list): of str
+            params(list): of dict, one per url, or None
+            encoding(str):
+            as_json(bool): parse responses as JSON
+            return_exceptions(bool): put exceptions in results rather than raise
 
         Returns:
-            str
+            list
+
+        """
+        import asyncio
+
+        urls = list(urls)
+        if not params:
+            params = [None] * len(urls)
+        elif len(params) != len(urls):
+            raise ValueError("params must have one item per url")
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._client() as client:
+            tasks = [
+                self._fetch(client, semaphore, url, param, encoding, as_json)
+                for url, param in zip(urls, params)
+            ]
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    async def aget_many(
+        self, urls, params=None, encoding="utf-8", return_exceptions=False
+    ):
+        """
+        Gets multiple urls concurrently, for use inside a running event loop
+
+        Args:
+            urls(list): of str
+            params(list): of dict, one per url
+            encoding(str): default utf-8
+            return_exceptions(bool): put exceptions in results rather than raise
+
+        Returns:
+            list: of str in same order as urls
+
+        """
+        return await self._gather(urls, params, encoding, False, return_exceptions)
+
+    async def aget_json_many(self, urls, params=None, return_exceptions=False):
+        """
+        Gets multiple JSON resources concurrently, for use inside a running event loop
+
+        Args:
+            urls(list): of str
+            params(list): of dict, one per url
+            return_exceptions(bool): put exceptions in results rather than raise
+
+        Returns:
+            list: of parsed JSON in same order as urls
+
+        """
+        return await self._gather(urls, params, None, True, return_exceptions)
+
+    def get_many(self, urls, params=None, encoding="utf-8", return_exceptions=False):
+        """
+        Gets multiple urls concurrently
+
+        Args:
+            urls(list): of str
+            params(list): of dict, one per url
+            encoding(str): default utf-8
+            return_exceptions(bool): put exceptions in results rather than raise
+
+        Returns:
+            list: of str in same order as urls
+
+        """
+        import asyncio
+
+        return asyncio.run(self.aget_many(urls, params, encoding, return_exceptions))
+
+    def get_json_many(self, urls, params=None, return_exceptions=False):
+        """
+        Gets multiple JSON resources concurrently
+
+        Args:
+            urls(list): of str
+            params(list): of dict, one per url
+            return_exceptions(bool): put exceptions in results rather than raise
+
+        Returns:
+            list: of parsed JSON in same order as urls
+
+        """
+        import asyncio
+
+        return asyncio.run(self.aget_json_many(urls, params, return_exceptions))
+
+    def iter_json_many(self, urls, params=None, return_exceptions=False):
+        """
+        Gets multiple JSON resources concurrently, yielding each as it completes.
+        Requests still pending are cancelled if the iterator is closed early.
+
+        Args:
+            urls(list): of str
+            params(list): of dict, one per url
+            return_exceptions(bool): yield exceptions rather than raise
+
+        Returns:
+            iterator: of (url, parsed JSON) in completion order
 
         """
-        fmt = WaybackScraper.format_type(datestr)
-        newfmt = WaybackScraper.site_format(site)
-        if fmt and newfmt:
+        import asyncio
+
+        urls = list(urls)
+        if not params:
+            params = [None] * len(urls)
+        elif len(params) != len(urls):
+            raise ValueError("params must have one item per url")
+        if not urls:
+            return
+
+        async def _open():
+            return self._client(), asyncio.Semaphore(self.concurrency)
+
+        async def _one(client, semaphore, url, param):
             try:
-                dtobj = datetime.datetime.strptime(datestr, fmt)
-                return datetime.datetime.strftime(dtobj, newfmt)
-            except BaseException:
-                return None
+                return url, await self._fetch(client, semaphore, url, param, None, True)
+            except Exception as err:
+                if not return_exceptions:
+                    raise
+                return url, err
+
+        # drive the loop by hand so results reach the caller as they arrive
+        loop = asyncio.new_event_loop()
+        client, semaphore = loop.run_until_complete(_open())
+        pending = {
+            loop.create_task(_one(client, semaphore, url, param))
+            for url, param in zip(urls, params)
+        }
+        try:
+            while pending:
+                done, pending = loop.run_until_complete(
+                    asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True)
+                )
+            loop.run_until_complete(client.close())
+            loop.close()
+
+
+class BrowserScraper:
+    """
+    Scraper using selenium
+
+    """
+
+    # method recorded for rendered pages, keeps them apart from raw responses
+    CACHE_METHOD = "BROWSER"
+
+    def __init__(
+        self,
+        profile,
+        visible=False,
+        cache_dir=None,
+        capture=False,
+        cache_name=None,
+        cache=None,
+        expire_hours=168,
+        engine="firefox",
+        xvfb=False,
+        block=BLOCK_RESOURCES,
+        window_size=(1280, 800),
+    ):
+        """
+        Scraper using selenium. Browser is launched on first cache miss.
+
+        Args:
+            profile(str): path to firefox profile, or chrome user data dir
+            visible(bool): show browser, run headless if False
+            cache_dir(str): directory for cache database browser.sqlite
+            capture(bool): record network responses, requires selenium-wire;
+                a list of url regexes records only matching requests
+            cache_name(str): cache database, same format as RequestScraper
+            cache(ResponseCache): shared cache, True for default cache
+            expire_hours(int): default time to live of cached pages
+            engine(str): 'firefox' or 'chrome', chrome also drives chromium
+            xvfb(bool): run visible browser in virtual display instead of headless,
+                for sites that block headless browsers
+            block(tuple): resources not loaded, any of 'images', 'fonts', 'css';
+                chrome cannot block fonts
+            window_size(tuple): width, height
+
+        """
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.urls = []
+        self.provenance = []
+        self.pages = 0
+        self.profile = profile
+        self.visible = visible
+        self.capture = capture
+        self.engine = engine
+        self.xvfb = xvfb
+        self.block = tuple(block or ())
+        self.window_size = window_size
+        self.display = None
+        self._browser = None
+        self._closed = False
+        self._procs = []
+        if isinstance(cache, ResponseCache):
+            self.cache = cache
+        elif cache_name or cache_dir or cache:
+            if cache_name or not cache_dir:
+                path = cache_path(cache_name)
+            else:
+                path = os.path.join(cache_dir, "browser.sqlite")
+            self.cache = ResponseCache(path, expire_hours)
+        else:
+            self.cache = None
+        _BROWSERS.add(self)
+
+    @property
+    def browser(self):
+        """
+        Selenium webdriver, launched on first use
+
+        """
+        if self._browser is None:
+            if self._closed:
+                raise RuntimeError("browser is closed")
+            self._launch()
+        return self._browser
+
+    def launch(self):
+        """
+        Starts browser now rather than on first cache miss, e.g. to warm a pool
+
+        Returns:
+            webdriver
+
+        """
+        return self.browser
+
+    def _launch(self):
+        """
+        Starts browser, and virtual display if xvfb is on
+
+        Returns:
+            None
+
+        """
+        if self.capture:
+            from seleniumwire import webdriver
         else:
+            from selenium import webdriver
+
+        try:
+            if self.xvfb and not self.visible:
+                from pyvirtualdisplay import Display
+
+                self.display = Display(visible=0, size=self.window_size)
+                self.display.start()
+            if self.engine == "chrome":
+                browser = self._chrome(webdriver)
+            else:
+                browser = self._firefox(webdriver)
+            self._browser = browser
+            browser.set_page_load_timeout(30)
+            if isinstance(self.capture, (list, tuple)):
+                browser.scopes = list(self.capture)
+            self._procs = self._process_tree()
+        except BaseException:
+            self.close()
+            raise
+
+    def _headless(self):
+        """
+        Tests if browser should run in its native headless mode
+
+        Returns:
+            bool
+
+        """
+        return not self.visible and not self.xvfb
+
+    def _firefox(self, webdriver):
+        """
+        Creates firefox driver
+
+        Args:
+            webdriver(module): selenium or seleniumwire webdriver
+
+        Returns:
+            WebDriver
+
+        """
+        from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+
+        caps = DesiredCapabilities.FIREFOX.copy()
+        caps["marionette"] = True
+        options = webdriver.FirefoxOptions()
+        if self._headless():
+            options.add_argument("-headless")
+            options.add_argument(f"--width={self.window_size[0]}")
+            options.add_argument(f"--height={self.window_size[1]}")
+        profile = webdriver.FirefoxProfile(self.profile)
+        for resource in self.block:
+            for pref, value in FIREFOX_BLOCK_PREFS[resource].items():
+                profile.set_preference(pref, value)
+        return webdriver.Firefox(
+            capabilities=caps,
+            firefox_profile=profile,
+            options=options,
+            log_path=os.devnull,
+        )
+
+    def _chrome(self, webdriver):
+        """
+        Creates chrome or chromium driver
+
+        Args:
+            webdriver(module): selenium or seleniumwire webdriver
+
+        Returns:
+            WebDriver
+
+        """
+        options = webdriver.ChromeOptions()
+        if self._headless():
+            options.add_argument("--headless")
+        options.add_argument("--window-size={},{}".format(*self.window_size))
+        if self.profile:
+            options.add_argument(f"--user-data-dir={self.profile}")
+        prefs = {}
+        for resource in self.block:
+            prefs.update(CHROME_BLOCK_PREFS[resource])
+        if prefs:
+            options.add_experimental_option("prefs", prefs)
+        return webdriver.Chrome(options=options, service_log_path=os.devnull)
+
+    def _cached(self, url):
+        """
+        Gets fresh cached body for url
+
+        Args:
+            url(str):
+
+        Returns:
+            bytes or None
+
+        """
+        if self.cache is None:
+            return None
+        cached = self.cache.get(self.cache.key(self.CACHE_METHOD, url))
+        if not self.cache.fresh(cached):
             return None
+        self.provenance.append((url, "cache"))
+        return cached.body
 
-    @staticmethod
-    def format_type(datestr):
+    def _store(self, url, content, content_type):
         """
-        Uses regular expressions to determine format of datestring
+        Records page loaded by browser, caching it if cache is on
 
         Args:
-            datestr (str): date string in a variety of different formats
+            url(str):
+            content(str):
+            content_type(str): stored as Content-Type header
 
         Returns:
-            fmt (str): format string for date
+            None
 
         """
-        val = None
-        if re.match(r"\d{1,2}_\d{1,2}_\d{4}", datestr):
-            val = WaybackScraper.site_format("fl")
-        elif re.match(r"\d{4}-\d{2}-\d{2}", datestr):
-            val = WaybackScraper.site_format("nfl")
-        elif re.match(r"\d{1,2}-\d{1,2}-\d{4}", datestr):
-            val = WaybackScraper.site_format("std")
-        elif re.match(r"\d{1,2}/\d{1,2}/\d{4}", datestr):
-            val = WaybackScraper.site_format("odd")
-        elif re.match(r"\d{8}", datestr):
-            val = WaybackScraper.site_format("db")
-        elif re.match(r"\w+ \d+, \d+", datestr):
-            val = WaybackScraper.site_format("bdy")
-        return val
+        self.provenance.append((url, "network"))
+        if self.cache is not None:
+            self.cache.set(
+                self.cache.key(self.CACHE_METHOD, url),
+                self.CACHE_METHOD,
+                url,
+                200,
+                {"Content-Type": content_type},
+                content.encode("utf-8"),
+            )
 
-    @staticmethod
-    def site_format(site):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        """
+        Closes browser if caller did not
+
+        """
+        if hasattr(self, "_closed"):
+            self.close()
+
+    def _process_tree(self):
+        """
+        Live processes started by this browser: driver and its children
+
+        Returns:
+            list: of psutil.Process
+
+        """
+        import psutil
+
+        procs = {proc.pid: proc for proc in self._procs}
+        try:
+            driver = psutil.Process(self._browser.service.process.pid)
+            for proc in [driver] + driver.children(recursive=True):
+                procs[proc.pid] = proc
+        except (AttributeError, psutil.Error):
+            pass
+        # is_running also checks create time, so reused pids are skipped
+        return [proc for proc in procs.values() if proc.is_running()]
+
+    def close(self):
         """
-        Stores date formats used by different sites
+        Quits browser, then kills any of its own processes left running and
+        stops its virtual display. Other scrapers' processes are untouched.
+
+        Returns:
+            None
+
+        """
+        if self._closed:
+            return
+        self._closed = True
+        _BROWSERS.discard(self)
+        procs = []
+        if self._browser:
+            try:
+                procs = self._process_tree()
+            except ImportError:
+                pass
+            try:
+                self._browser.quit()
+            except Exception as err:
+                logging.warning("could not quit browser: %s", err)
+        if procs:
+            import psutil
+
+            _, alive = psutil.wait_procs(procs, timeout=5)
+            for proc in alive:
+                logging.info("killing %s %s", proc.pid, proc.name())
+                try:
+                    proc.kill()
+                except psutil.Error:
+                    pass
+        if self.display:
+            try:
+                self.display.stop()
+            except Exception as err:
+                logging.warning("could not stop display: %s", err)
+
+    def memory(self):
+        """
+        Resident memory of driver and the browser processes it started
+
+        Returns:
+            int: bytes
+
+        """
+        import psutil
+
+        total = 0
+        for proc in self._process_tree():
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def get(self, url, payload=None):
+        """
+        Gets page using headless firefox
 
         Args:
-            site(str):
+            url: string
 
         Returns:
-            str
+            string of HTML
+        """
+        if payload:
+            url = f"{url}?{urlencode(payload)}"
+        self.urls.append(url)
+        cached = self._cached(url)
+        if cached is not None:
+            return cached.decode("utf-8")
+
+        from selenium.common.exceptions import (
+            TimeoutException,
+            InsecureCertificateException,
+        )
+
+        self.pages += 1
+        if self.capture:
+            del self.browser.requests
+        try:
+            self.browser.get(url)
+        except (InsecureCertificateException, BrokenPipeError, TimeoutException):
+            time.sleep(1)
+            self.browser.get(url)
+        content = self.browser.page_source
+        self._store(url, content, "text/html; charset=utf-8")
+        return content
 
+    def get_json(self, url, payload=None):
         """
-        return {
-            "std": "%m-%d-%Y",
-            "fl": "%m_%d_%Y",
-            "fl2017": "%m-%d-%Y",
-            "fl_matchups": "%-m-%-d-%Y",
-            "nfl": "%Y-%m-%d",
-            "odd": "%m/%d/%Y",
-            "db": "%Y%m%d",
-            "bdy": "%B %d, %Y",
-            "espn_fantasy": "%Y%m%d",
-        }.get(site, None)
 
-    @staticmethod
-    def strtodate(dstr):
+        Args:
+            url:
+
+        Returns:
+            dict parsed json
+        """
+        if payload:
+            url = "{}?{}".format(url, urlencode(payload))
+        self.urls.append(url)
+        cached = self._cached(url)
+        if cached is not None:
+            return json.loads(cached)
+        self.pages += 1
+        if self.capture:
+            del self.browser.requests
+        self.browser.get(url)
+        content = self.browser.find_element_by_tag_name("body").text
+        data = json.loads(content)
+        self._store(url, content, "application/json")
+        return data
+
+    def export_session(self, scraper):
         """
-        Converts date formats used by different sites
+        Copies browser cookies and user agent into a RequestScraper, so api
+        calls that only need the browser's login can go over plain HTTP.
+        Only cookies visible to the current page are copied.
 
         Args:
-            dstr(dstr): datestring
+            scraper(RequestScraper): or subclass, e.g. AsyncRequestScraper
 
         Returns:
-            datetime.datetime
+            RequestScraper
 
         """
-        fmt = WaybackScraper.format_type(dstr)
-        return datetime.datetime.strptime(dstr, fmt)
+        from requests.cookies import create_cookie
 
-    @staticmethod
-    def subtract_datestr(date1, date2):
+        scraper.headers = {
+            "User-Agent": self.browser.execute_script("return navigator.userAgent;")
+        }
+        for cookie in self.browser.get_cookies():
+            scraper.session.cookies.set_cookie(
+                create_cookie(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie.get("domain", ""),
+                    path=cookie.get("path", "/"),
+                    secure=cookie.get("secure", False),
+                    expires=cookie.get("expiry"),
+                )
+            )
+        return scraper
+
+    def request_scraper(self, scraper_class=RequestScraper, **kwargs):
         """
-        Subtracts d2 from d1
+        Creates RequestScraper that carries on this browser's session
 
         Args:
-            date1(str): '2018-01-01'
-            date2(str): '2017-12-12'
+            scraper_class(type): RequestScraper or subclass
+            **kwargs: passed to scraper_class, cache defaults to browser's cache
 
         Returns:
-            int: number of days between dates
+            RequestScraper
 
         """
-        if isinstance(date1, str):
-            delta = WaybackScraper.strtodate(date1) - WaybackScraper.strtodate(date2)
-        else:
-            delta = date1 - date2
-        return delta.days
+        if self.cache is not None:
+            kwargs.setdefault("cache", self.cache)
+        return self.export_session(scraper_class(**kwargs))
 
-    @staticmethod
-    def today(fmt="nfl"):
+    def get_jsvar(self, varname):
         """
-        Datestring for today's date
+        Gets python data structure of javascript variable
 
         Args:
-            fmt(str): 'nfl'
+            varname (str): name of javascript variable
 
         Returns:
-            str
+            whatever the type of the javascript variable
+
+        """
+        from selenium.webdriver.remote.errorhandler import WebDriverException
+
+        try:
+            return self.browser.execute_script("return {};".format(varname))
+        except WebDriverException as err:
+            logging.exception(err)
+            return None
+
+    def captured(self, pattern=None):
+        """
+        Requests recorded in capture mode that got a response, oldest first.
+        Each get clears requests recorded for the previous page.
 
+        Args:
+            pattern(str): regular expression searched for in request url
+
+        Returns:
+            list: of seleniumwire Request
+
+        """
+        if not self.capture:
+            raise ValueError("capture mode is off, create scraper with capture=True")
+        regex = re.compile(pattern) if pattern else None
+        return [
+            request
+            for request in self.browser.requests
+            if request.response and (not regex or regex.search(request.url))
+        ]
+
+    def captured_json(self, pattern=None, wait=None):
         """
-        fmt = WaybackScraper.site_format(fmt)
-        if not fmt:
-            raise ValueError("invalid date format")
-        return datetime.datetime.strftime(datetime.datetime.today(), fmt)
+        JSON payloads the page downloaded, e.g. XHR/fetch API responses
+
+        Args:
+            pattern(str): regular expression searched for in request url
+            wait(float): seconds to wait for a matching request to finish
+
+        Returns:
+            dict: of url: parsed json
+
+        """
+        from selenium.common.exceptions import TimeoutException
+        from seleniumwire.utils import decode
+
+        if wait and pattern:
+            try:
+                self.browser.wait_for_request(pattern, timeout=wait)
+            except TimeoutException:
+                logging.info("no request matching %s after %s s", pattern, wait)
+        payloads = {}
+        for request in self.captured(pattern):
+            headers = request.response.headers
+            if "json" not in headers.get("Content-Type", ""):
+                continue
+            body = decode(
+                request.response.body, headers.get("Content-Encoding", "identity")
+            )
+            try:
+                payloads[request.url] = json.loads(body)
+            except ValueError:
+                logging.warning("could not parse json from %s", request.url)
+        return payloads
+
+    def requests(self, dump=True):
+        """
+        Retrieves and dumps request information
+
+        Args:
+            dump(bool): print request information
+
+        Returns:
+            list
+
+        """
+        responses = []
+        for request in self.captured():
+            responses.append(request.response)
+            if dump:
+                print(
+                    request.url,
+                    request.response.status_code,
+                    request.response.headers.get("Content-Type"),
+                )
+        return responses
+
+
+class WaybackScraper(AsyncRequestScraper):
+    """
+    Scraper for wayback machine. Subclass of AsyncRequestScraper.
+
+    Usage:
+        s = WaybackScraper(delay=1)
+        pages = s.get_wayback_many(url, date_list('10_09_2018', '09_06_2018'), 2)
+
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Scraper for waybackmachine API
+
+        Args:
+            **kwargs: passed to AsyncRequestScraper, e.g. concurrency
+
+        """
+        AsyncRequestScraper.__init__(self, **kwargs)
+        self.wburl = "http://archive.org/wayback/available?url={}&timestamp={}"
+        self.cdxurl = "http://web.archive.org/cdx/search/cdx"
+        self.snapshot_url = "http://web.archive.org/web/{}/{}"
+
+    # date helpers kept on the class for existing callers
+    convert_format = staticmethod(dates.convert_format)
+    format_type = staticmethod(dates.format_type)
+    site_format = staticmethod(dates.site_format)
+    strtodate = staticmethod(dates.strtodate)
+    subtract_datestr = staticmethod(dates.subtract_datestr)
+    today = staticmethod(dates.today)
 
     def get_wayback(self, url, datestr=None, max_delta=None):
         """
@@ -607,6 +1663,144 @@ class WaybackScraper(RequestScraper):
 
         return content, time_stamp
 
+    @staticmethod
+    def _dbdate(value):
+        """
+        Converts date to '%Y%m%d' string
+
+        Args:
+            value: datestring in any format format_type knows, date or datetime
+
+        Returns:
+            str
+
+        """
+        if isinstance(value, str):
+            return WaybackScraper.convert_format(value, "db")
+        return value.strftime("%Y%m%d")
+
+    def cdx(self, url, start=None, end=None):
+        """
+        Lists snapshots of url with one index query, first capture of each day
+
+        Args:
+            url(str): of the site you want, not the wayback machine
+            start(str): first day, '%Y%m%d', None for earliest
+            end(str): last day, '%Y%m%d', None for latest
+
+        Returns:
+            list: of dict with timestamp, original, digest, sorted by timestamp
+
+        """
+        params = {
+            "url": url,
+            "output": "json",
+            "fl": "timestamp,original,digest",
+            "filter": "statuscode:200",
+            "collapse": "timestamp:8",
+        }
+        if start:
+            params["from"] = start
+        if end:
+            params["to"] = end
+        # snapshots of past days do not change, but ranges reaching today do
+        if self.cache is not None and (not end or end >= WaybackScraper.today("db")):
+            self.cache.delete(
+                self.cache.key("GET", self.cdxurl, params, self.session.headers)
+            )
+        rows = self.get_json(self.cdxurl, payload=params)
+        if not rows:
+            return []
+        header = rows[0]
+        snapshots = [dict(zip(header, row)) for row in rows[1:]]
+        return sorted(snapshots, key=lambda x: x["timestamp"])
+
+    @staticmethod
+    def closest(snapshots, datestr, max_delta=None):
+        """
+        Finds snapshot captured closest to date, earlier one on ties
+
+        Args:
+            snapshots(list): of dict from cdx, sorted by timestamp
+            datestr(str): '%Y%m%d'
+            max_delta(int): most days snapshot can be from date, None for no limit
+
+        Returns:
+            dict or None
+
+        """
+        if not snapshots:
+            return None
+        pos = bisect.bisect_left([x["timestamp"][:8] for x in snapshots], datestr)
+        candidates = snapshots[max(pos - 1, 0) : pos + 1]
+        day = datetime.datetime.strptime(datestr, "%Y%m%d")
+
+        def _days(snapshot):
+            snapped = datetime.datetime.strptime(snapshot["timestamp"][:8], "%Y%m%d")
+            return abs((snapped - day).days)
+
+        best = min(candidates, key=_days)
+        if max_delta is not None and _days(best) > max_delta:
+            return None
+        return best
+
+    def get_wayback_many(self, url, dates, max_delta=None, encoding="utf-8"):
+        """
+        Gets page from the wayback machine for many dates, with one index query
+        and concurrent, cached snapshot fetches. Dates whose snapshots have the
+        same content share one str object.
+
+        Args:
+            url(str): of the site you want, not the wayback machine
+            dates(list): of datestrings, dates or datetimes
+            max_delta(int): most days snapshot can be from date, None for no limit
+            encoding(str): default utf-8
+
+        Returns:
+            dict: of date: (content, time_stamp), (None, None) if no snapshot
+
+        """
+        dates = list(dates)
+        dbdates = {d: self._dbdate(d) for d in dates}
+        start = end = None
+        if max_delta is not None and dates:
+            delta = datetime.timedelta(days=max_delta)
+            start = self._dbdate(
+                datetime.datetime.strptime(min(dbdates.values()), "%Y%m%d") - delta
+            )
+            end = self._dbdate(
+                datetime.datetime.strptime(max(dbdates.values()), "%Y%m%d") + delta
+            )
+        snapshots = self.cdx(url, start, end)
+
+        selected = {}
+        for d in dates:
+            snapshot = self.closest(snapshots, dbdates[d], max_delta)
+            if snapshot:
+                selected[d] = snapshot
+            else:
+                logging.error("no snapshot of %s near %s", url, dbdates[d])
+        # adjacent dates often resolve to the same snapshot, or to snapshots
+        # with identical content, so each distinct body is fetched once
+        unique = {}
+        for snapshot in selected.values():
+            unique.setdefault(snapshot.get("digest") or snapshot["timestamp"], snapshot)
+        urls = [
+            self.snapshot_url.format(x["timestamp"], x["original"])
+            for x in unique.values()
+        ]
+        logging.debug("fetching %s snapshots for %s dates", len(urls), len(dates))
+        pages = dict(zip(unique, self.get_many(urls, encoding=encoding)))
+        results = {}
+        for d in dates:
+            snapshot = selected.get(d)
+            if snapshot:
+                content = pages[snapshot.get("digest") or snapshot["timestamp"]]
+                results[d] = (content, snapshot["timestamp"][:8])
+            else:
+                results[d] = (None, None)
+        return results
+
 
 if __name__ == "__main__":
     pass
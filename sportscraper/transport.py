@@ -0,0 +1,255 @@
+"""
+transport.py
+
+Connection pools shared by all scrapers in the same process
+
+"""
+
+import io
+import logging
+import threading
+
+
+# connections kept open per host, for hosts we fan out against
+HOST_POOL_SIZES = {
+    "api.playdraft.com": 16,
+    "api.draftkings.com": 16,
+    "fantasysports.yahooapis.com": 8,
+}
+
+_TRANSPORTS = {}
+_TRANSPORTS_LOCK = threading.Lock()
+
+
+class HTTP2Adapter:
+    """
+    Transport adapter for requests.Session that sends requests with httpx over
+    HTTP/2 when the server supports it. Requires httpx and h2.
+
+    Cookies set by responses are not added to the session cookie jar.
+
+    """
+
+    def __init__(self, max_connections=10, max_keepalive=10, client=None):
+        """
+        Creates adapter
+
+        Args:
+            max_connections(int): total connections, default 10
+            max_keepalive(int): idle connections kept open, default 10
+            client(httpx.Client): use existing client, e.g. with a mock transport
+
+        """
+        if client is None:
+            import httpx
+
+            client = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive,
+                ),
+            )
+        self.client = client
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        """
+        Sends PreparedRequest
+
+        Args:
+            request(PreparedRequest):
+            stream(bool): ignored, body is always read
+            timeout(float): seconds, or (connect, read) tuple
+            verify, cert, proxies: ignored, configure on client instead
+
+        Returns:
+            Response
+
+        """
+        from requests.models import Response
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+
+        if isinstance(timeout, tuple):
+            timeout = timeout[1]
+        http2_resp = self.client.request(
+            request.method,
+            request.url,
+            headers=dict(request.headers),
+            content=request.body,
+            timeout=timeout,
+        )
+        resp = Response()
+        resp.status_code = http2_resp.status_code
+        resp.reason = http2_resp.reason_phrase
+        resp.headers = CaseInsensitiveDict(http2_resp.headers)
+        # httpx has already decoded the body
+        resp.headers.pop("Content-Encoding", None)
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp._content = http2_resp.content
+        resp._content_consumed = True
+        resp.raw = io.BytesIO(http2_resp.content)
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        resp.http_version = http2_resp.http_version
+        return resp
+
+    def close(self):
+        """
+        Closes httpx client
+
+        """
+        self.client.close()
+
+
+class Transport:
+    """
+    Pooled keep-alive connections. Every session mounted on the same Transport
+    reuses its connections, so scrapers stop repeating TCP and TLS handshakes.
+
+    Usage:
+        transport = Transport(pool_maxsize=20)
+        s = draft.Scraper(transport=transport)
+        s2 = draftkings.Scraper(transport=transport)
+
+    """
+
+    def __init__(
+        self,
+        pool_connections=10,
+        pool_maxsize=10,
+        host_pool_sizes=None,
+        pool_block=False,
+        http2=False,
+    ):
+        """
+        Creates transport
+
+        Args:
+            pool_connections(int): number of hosts to keep pools for, default 10
+            pool_maxsize(int): connections kept per host, default 10
+            host_pool_sizes(dict): host: pool_maxsize, updates HOST_POOL_SIZES
+            pool_block(bool): wait for a free connection rather than open extra ones
+            http2(bool): use HTTP2Adapter for https, requires httpx and h2
+
+        """
+        logging.getLogger(__name__).addHandler(logging.NullHandler())
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = dict(HOST_POOL_SIZES)
+        if host_pool_sizes:
+            self.host_pool_sizes.update(host_pool_sizes)
+        self.pool_block = pool_block
+        self.http2 = http2
+        self._adapters = {}
+        self._lock = threading.Lock()
+
+    def adapter(self, prefix="https://"):
+        """
+        Gets shared adapter for url prefix
+
+        Args:
+            prefix(str): 'http://', 'https://' or 'https://<host>'
+
+        Returns:
+            HTTPAdapter or HTTP2Adapter
+
+        """
+        with self._lock:
+            adapter = self._adapters.get(prefix)
+            if adapter:
+                return adapter
+            host = prefix.split("://", 1)[-1]
+            pool_maxsize = self.host_pool_sizes.get(host, self.pool_maxsize)
+            if self.http2 and prefix.startswith("https://"):
+                adapter = HTTP2Adapter(
+                    max_connections=pool_maxsize, max_keepalive=pool_maxsize
+                )
+            else:
+                from requests.adapters import HTTPAdapter
+
+                adapter = HTTPAdapter(
+                    pool_connections=1 if host else self.pool_connections,
+                    pool_maxsize=pool_maxsize,
+                    pool_block=self.pool_block,
+                )
+            self._adapters[prefix] = adapter
+            return adapter
+
+    def prefixes(self):
+        """
+        Url prefixes that get their own adapter
+
+        Returns:
+            list: of str
+
+        """
+        return ["http://", "https://"] + [
+            f"https://{host}" for host in sorted(self.host_pool_sizes)
+        ]
+
+    def mount(self, session, cache=None, rate_limiter=None):
+        """
+        Mounts shared adapters on session
+
+        Args:
+            session(Session):
+            cache(ResponseCache): serve requests from cache before using network
+            rate_limiter(RateLimiter): wait for host rate limit before each
+                request sent over network
+
+        Returns:
+            Session
+
+        """
+        from .cache import CacheAdapter
+        from .ratelimit import ThrottledAdapter
+
+        for prefix in self.prefixes():
+            adapter = self.adapter(prefix)
+            if rate_limiter:
+                adapter = ThrottledAdapter(adapter, rate_limiter)
+            if cache is not None:
+                adapter = CacheAdapter(cache, adapter)
+            session.mount(prefix, adapter)
+        return session
+
+    def close(self):
+        """
+        Closes all pooled connections
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            for adapter in self._adapters.values():
+                adapter.close()
+            self._adapters = {}
+
+
+def shared_transport(**kwargs):
+    """
+    Gets process-wide transport, one per distinct set of settings
+
+    Args:
+        **kwargs: passed to Transport
+
+    Returns:
+        Transport
+
+    """
+    key = tuple(sorted((k, repr(v)) for k, v in kwargs.items()))
+    with _TRANSPORTS_LOCK:
+        transport = _TRANSPORTS.get(key)
+        if not transport:
+            transport = Transport(**kwargs)
+            _TRANSPORTS[key] = transport
+        return transport
+
+
+if __name__ == "__main__":
+    pass
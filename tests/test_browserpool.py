@@ -0,0 +1,88 @@
+# test_browserpool.py
+
+import pytest
+
+from sportscraper.browserpool import BrowserPool
+
+
+class FakeBrowser:
+    '''Stands in for BrowserScraper without starting firefox'''
+
+    def __init__(self, rss=0):
+        self.pages = 0
+        self.rss = rss
+        self.closed = False
+        self.launched = False
+
+    def launch(self):
+        self.launched = True
+
+    def memory(self):
+        return self.rss
+
+    def close(self):
+        self.closed = True
+
+
+def test_lease_reuses_browser():
+    pool = BrowserPool(size=2, scraper_class=FakeBrowser)
+    assert pool.started == 2
+    with pool.lease() as browser:
+        browser.pages += 1
+    with pool.lease() as again:
+        assert again is browser
+    assert pool.started == 2
+
+
+def test_warm_launches():
+    pool = BrowserPool(size=2, scraper_class=FakeBrowser)
+    assert all(browser.launched for browser in list(pool._idle.queue))
+    cold = BrowserPool(size=1, scraper_class=FakeBrowser, warm=False)
+    with cold.lease() as browser:
+        assert not browser.launched
+
+
+def test_recycle_after_pages():
+    pool = BrowserPool(size=1, max_pages=3, scraper_class=FakeBrowser)
+    with pool.lease() as browser:
+        browser.pages = 3
+    assert browser.closed
+    assert pool.recycled == 1
+    with pool.lease() as fresh:
+        assert fresh is not browser
+    assert pool.started == 2
+
+
+def test_recycle_on_memory():
+    pool = BrowserPool(size=1, max_memory=100, scraper_class=FakeBrowser, rss=200)
+    with pool.lease() as browser:
+        pass
+    assert browser.closed
+
+
+def test_discard_on_error():
+    pool = BrowserPool(size=1, scraper_class=FakeBrowser, warm=False)
+    with pytest.raises(ValueError):
+        with pool.lease() as browser:
+            raise ValueError('page broke')
+    assert browser.closed
+    assert len(pool) == 0
+
+
+def test_acquire_timeout():
+    pool = BrowserPool(size=1, scraper_class=FakeBrowser)
+    browser = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    pool.release(browser)
+    assert pool.acquire(timeout=0.01) is browser
+
+
+def test_close():
+    with BrowserPool(size=2, scraper_class=FakeBrowser) as pool:
+        browser = pool.acquire()
+    assert not browser.closed
+    pool.release(browser)
+    assert browser.closed
+    with pytest.raises(RuntimeError):
+        pool.acquire()
@@ -0,0 +1,132 @@
+# test_cache.py
+
+import time
+
+import pytest
+
+from sportscraper.cache import FileCache, ResponseCache, cache_path, normalize_url
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'http.sqlite'))
+    yield cache
+    cache.close()
+
+
+def test_cache_path(tmpdir):
+    assert cache_path('test-draft').endswith('/sportscraper/test-draft.sqlite')
+    assert cache_path('/tmp/x.sqlite') == '/tmp/x.sqlite'
+    # directory left by cachecontrol before upgrade
+    assert cache_path(str(tmpdir)) == str(tmpdir.join('http.sqlite'))
+
+
+def test_normalize_url():
+    url = 'HTTPS://API.playdraft.com/v2/x?b=2&a=1#frag'
+    assert normalize_url(url) == 'https://api.playdraft.com/v2/x?a=1&b=2'
+    assert normalize_url('https://api.playdraft.com/v2/x', {'b': 2, 'a': 1}) == \
+        normalize_url(url)
+
+
+def test_key(cache):
+    url = 'https://api.playdraft.com/v2/x'
+    assert cache.key('get', url + '?a=1&b=2') == cache.key('GET', url, {'b': 2, 'a': 1})
+    assert cache.key('GET', url, headers={'Accept': 'text/html'}) != \
+        cache.key('GET', url, headers={'Accept': 'application/json'})
+    assert cache.key('GET', url, headers={'Authorization': 'Bearer a'}) != \
+        cache.key('GET', url, headers={'Authorization': 'Bearer b'})
+    assert cache.key('GET', url, headers={'User-Agent': 'a'}) == \
+        cache.key('GET', url, headers={'User-Agent': 'b'})
+
+
+def test_set_get(cache):
+    url = 'https://api.playdraft.com/v2/x'
+    key = cache.key('GET', url)
+    body = b'{"a": 1}' * 100
+    headers = {'Content-Type': 'application/json', 'Content-Encoding': 'gzip', 'ETag': 'abc'}
+    cache.set(key, 'GET', url, 200, headers, body)
+    cached = cache.get(key)
+    assert cached.body == body
+    assert cached.etag == 'abc'
+    assert 'Content-Encoding' not in cached.headers
+    assert cache.fresh(cached)
+    assert cache.size() < len(body)
+    assert cache.get(cache.key('GET', url + '/y')) is None
+
+
+def test_expire(cache):
+    url = 'https://api.playdraft.com/v1/clustered_complete_contests'
+    key = cache.key('GET', url)
+    cache.set(key, 'GET', url, 200, {'ETag': 'abc'}, b'{}')
+    assert cache.fresh(cache.get(key))
+    cache.expire(key)
+    cached = cache.get(key)
+    assert not cache.fresh(cached)
+    assert cached.etag == 'abc'
+
+
+def test_content_addressed(cache):
+    body = b'same payload'
+    for url in ('https://a.com/1', 'https://a.com/2'):
+        cache.set(cache.key('GET', url), 'GET', url, 200, {}, body)
+    assert len(cache) == 2
+    size = cache.size()
+    cache.delete(cache.key('GET', 'https://a.com/1'))
+    assert cache.size() == size
+    cache.delete(cache.key('GET', 'https://a.com/2'))
+    assert cache.size() == 0
+
+
+def test_host_ttl(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'ttl.sqlite'), host_ttls={'a.com': -1})
+    key = cache.key('GET', 'https://a.com/1')
+    cache.set(key, 'GET', 'https://a.com/1', 200, {}, b'x')
+    assert not cache.fresh(cache.get(key))
+    cache.host_ttls['a.com'] = 60
+    cache.refresh(key, 'https://a.com/1')
+    assert cache.fresh(cache.get(key))
+
+
+def test_path_ttl(cache):
+    assert cache.ttl('https://api.playdraft.com/v2/window_clusters/1/complete_contests') \
+        == 15 * 60
+    assert cache.ttl('https://api.playdraft.com/v3/drafts/1') == 168 * 3600
+    assert cache.ttl('https://fantasysports.yahooapis.com/fantasy/v2/game/nfl') == 300
+    assert cache.ttl('https://api.draftkings.com/draftgroups/v1/draftgroups/1') == 900
+    cache.host_ttls['api.playdraft.com'] = 60
+    assert cache.ttl('https://api.playdraft.com/v3/drafts/1') == 60
+    assert cache.ttl('https://api.playdraft.com/v1/users/1/clustered_results') == 15 * 60
+
+
+def test_evict(cache):
+    for i in range(3):
+        url = f'https://a.com/{i}'
+        cache.set(cache.key('GET', url), 'GET', url, 200, {}, bytes([i]) * 1000)
+        time.sleep(0.01)
+    cache.get(cache.key('GET', 'https://a.com/0'))
+    cache.evict(max_size=cache.size() - 1)
+    assert cache.get(cache.key('GET', 'https://a.com/1')) is None
+    assert cache.get(cache.key('GET', 'https://a.com/0')) is not None
+
+
+def test_filecache(tmp_path):
+    fcache = FileCache(str(tmp_path))
+    key = fcache.key('https://a.com/x', {'b': 1, 'a': 2})
+    assert key == fcache.key('https://a.com/x?a=2&b=1')
+    assert fcache.get(key) is None
+    size = fcache.set(key, 'https://a.com/x', iter([b'caf', '\u00e9'.encode('utf-8')]))
+    assert size == 5
+    assert fcache.path(key).startswith(str(tmp_path / key[0:2] / key[2:4]))
+    assert fcache.get(key) == b'caf\xc3\xa9'
+    assert fcache.get(key, encoding='utf-8') == 'caf\u00e9'
+    assert not [f for f in tmp_path.rglob('*.tmp')]
+
+
+def test_filecache_expire(tmp_path):
+    fcache = FileCache(str(tmp_path), expire_hours=-1)
+    key = fcache.key('https://a.com/x')
+    fcache.set(key, 'https://a.com/x', [b'x'])
+    assert fcache.get(key) is None
+    assert fcache.get(key, stale=True) == b'x'
+    assert fcache.expire() == 1
+    assert not [f for f in tmp_path.rglob('*.gz')]
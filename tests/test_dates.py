@@ -35,6 +35,20 @@ def test_format_type():
     datestr = '01/01/2018'
     assert format_type(datestr) == '%m/%d/%Y'
 
+    assert format_type('October 5, 2018') == '%B %d, %Y'
+    assert format_type('foo') is None
+
+
+def test_parse_dates():
+    datestrs = ['10_05_2018', '2018-10-05', '10-05-2018', '10/05/2018', '20181005',
+                'October 5, 2018', '2018-10-05']
+    parsed = parse_dates(datestrs)
+    assert parsed == [datetime.datetime(2018, 10, 5)] * len(datestrs)
+    assert parse_dates(['1_2_2018', 'foo', '20181305'], errors='coerce') == [
+        datetime.datetime(2018, 1, 2), None, None]
+    with pytest.raises(ValueError):
+        parse_dates(['10_05_2018', 'foo'])
+
 
 def test_site_format():
     assert site_format('nfl') == '%Y-%m-%d'
@@ -69,3 +83,38 @@ def test_yesterday_x():
     fmt = 'nfl'
     assert yesterday_x(interval, fmt) == datetime.datetime.strftime(
         datetime.datetime.today() - datetime.timedelta(interval), '%Y-%m-%d')
+
+
+def test_date_list64():
+    np = pytest.importorskip('numpy')
+    days = date_list64('10_09_2018', '10_05_2018')
+    assert days.dtype == np.dtype('datetime64[D]')
+    assert days[0] == np.datetime64('2018-10-09')
+    assert [d.item() for d in days] == [d.date() for d in date_list('10_09_2018', '10_05_2018')]
+
+
+def test_datetostr64():
+    np = pytest.importorskip('numpy')
+    days = np.array(['2018-10-05', '2019-01-31', 'NaT'], dtype='datetime64[D]')
+    for site in ('nfl', 'fl', 'db', 'espn_fantasy', 'std', 'odd', 'bdy'):
+        expected = [datetostr(datetime.datetime(2018, 10, 5), site),
+                    datetostr(datetime.datetime(2019, 1, 31), site), '']
+        assert datetostr64(days, site).tolist() == expected
+    with pytest.raises(ValueError):
+        datetostr64(days, 'foo')
+
+
+def test_strtodate64():
+    np = pytest.importorskip('numpy')
+    expected = np.array(['2018-10-05', '2019-01-31'], dtype='datetime64[D]')
+    for site in ('nfl', 'fl', 'db', 'std', 'odd'):
+        datestrs = datetostr64(expected, site)
+        assert (strtodate64(datestrs, site) == expected).all()
+        assert (strtodate64(datestrs) == expected).all()
+    mixed = strtodate64([['1_2_2018', 'foo'], ['2018-01-02', '02_30_2018']], 'fl',
+                        errors='coerce')
+    assert mixed.shape == (2, 2)
+    assert mixed[0, 0] == mixed[1, 0] == np.datetime64('2018-01-02')
+    assert np.isnat(mixed[0, 1]) and np.isnat(mixed[1, 1])
+    with pytest.raises(ValueError):
+        strtodate64(['02_30_2018', '02_28_2018'], 'fl')
@@ -1,9 +1,13 @@
 # test_draft.py
 
+import io
+import json
+
 import pytest
 import random
 
-from sportscraper.draft import Scraper, Parser
+from sportscraper.draft import Agent, Scraper, Parser, SyncState
+from sportscraper.jsonstream import iter_resource
 from sportscraper.testconf import *
 
 
@@ -130,3 +134,264 @@ def test_window_cluster_results(scraper, parser):
                 scraper.window_cluster_results(window_cluster_id=window_cluster_id))
     assert isinstance(results, list)
     assert isinstance(random.choice(results), dict)
+
+
+def series_contest(contest_id):
+    return {'series_contest': {
+        'id': contest_id, 'participants': 2, 'sport_id': 1, 'entry_cost': '1.0',
+        'prize': '1.8',
+        'contest_type': {'seconds_per_pick': 30, 'salary_cap_amount': None,
+                         'seconds_per_bid': None, 'style': 'snake'},
+        'draft_rosters': [{'id': 1, 'pick_order': 1, 'winnings': '1.8', 'rank': 1,
+                           'points': '100.0', 'user_id': 7}],
+        'draft_sections': [{'section_id': 1, 'roster_points': {'1': '10.5'}}],
+        'users': [{'id': 7, 'username': 'u', 'experienced': True, 'skill_level': 1}],
+    }}
+
+
+class OfflineScraper:
+    '''Serves a window cluster of three contests, one of which fails'''
+
+    def window_cluster_results(self, file_name=None, window_cluster_id=None):
+        contests = []
+        for contest_id in ('a', 'b', 'c'):
+            contest = series_contest(contest_id)['series_contest']
+            contest['draft_rosters'] = contest['draft_rosters'] * 2
+            contests.append(contest)
+        return {'series_contests': contests}
+
+    def contest_results_many(self, contest_ids):
+        self.requested = list(contest_ids)
+        for contest_id in self.requested:
+            if contest_id == 'c':
+                yield contest_id, ValueError('bad gateway')
+            else:
+                yield contest_id, series_contest(contest_id)
+
+
+def test_agent_contest_results(tmpdir):
+    pytest.importorskip('requests')
+    checkpoint = str(tmpdir.join('finished.txt'))
+    agent = Agent(cache_name=str(tmpdir.join('draft.sqlite')))
+    agent.s = OfflineScraper()
+    results = list(agent.contest_results(1, checkpoint=checkpoint))
+    assert [r[0]['id'] for r in results] == ['a', 'b']
+    assert results[0][3] == [{'week_id': 1, 'team_id': '1', 'week_points': 10.5}]
+    assert open(checkpoint).read().split() == ['a', 'b']
+    assert list(agent.contest_results(1, checkpoint=checkpoint)) == []
+    assert agent.s.requested == ['c']
+
+
+def league(league_id, draft_time):
+    return {'id': league_id, 'prize': '25.0', 'time_window_id': 7, 'entry_cost': '1.0',
+            'draft_time': draft_time, 'max_participants': 6}
+
+
+class ListingScraper:
+    '''Serves bestball listings that grow between runs'''
+
+    def __init__(self):
+        self.drafts = [league(1, '2019-08-01T10:00:00Z'),
+                       league(2, '2019-08-02T10:00:00Z')]
+        self.refreshed = []
+
+    def clustered_complete_contests(self, file_name=None, refresh=False):
+        self.refreshed.append(refresh)
+        return {'window_clusters': [{'id': 9, 'header_text': 'NFL Best Ball'}]}
+
+    def complete_contests(self, file_name=None, window_cluster_id=None, refresh=False):
+        self.refreshed.append(refresh)
+        return {'drafts': list(self.drafts)}
+
+
+def test_bestball_leagues_sync(tmpdir):
+    pytest.importorskip('requests')
+    state_file = str(tmpdir.join('sync.json'))
+    agent = Agent(cache_name=str(tmpdir.join('draft.sqlite')))
+    agent.s = ListingScraper()
+    assert len(agent.bestball_leagues()) == 2
+    assert agent.s.refreshed == [False, False]
+    leagues = list(agent.bestball_leagues(state_file=state_file))
+    assert [lg['league_id'] for lg in leagues] == [1, 2]
+    assert agent.s.refreshed[2:] == [True, True]
+    assert list(agent.bestball_leagues(state_file=state_file)) == []
+
+    # late-finishing draft with earlier draft_time is still picked up,
+    # a league is only recorded once the caller is done with it
+    agent.s.drafts.append(league(3, '2019-07-31T10:00:00Z'))
+    agent.s.drafts.append(league(4, '2019-08-03T10:00:00Z'))
+    with pytest.raises(RuntimeError):
+        for lg in agent.bestball_leagues(state_file=state_file):
+            if lg['league_id'] == 4:
+                raise RuntimeError('job failed')
+    leagues = list(agent.bestball_leagues(state_file=state_file))
+    assert [lg['league_id'] for lg in leagues] == [4]
+    state = SyncState(state_file)
+    assert state.high_water(9) == '2019-08-03T10:00:00Z'
+    assert not state.is_new(9, {'id': 3, 'draft_time': '2019-07-31T10:00:00Z'})
+
+
+def test_bestball_leagues_sync_newest_first(tmpdir):
+    '''a run failing after the newest league does not hide older ones'''
+    pytest.importorskip('requests')
+    state_file = str(tmpdir.join('sync.json'))
+    agent = Agent(cache_name=str(tmpdir.join('draft.sqlite')))
+    agent.s = ListingScraper()
+    agent.s.drafts = [league(5, '2019-08-30T10:00:00Z'),
+                      league(6, '2019-08-01T10:00:00Z'),
+                      league(7, '2019-07-01T10:00:00Z')]
+    with pytest.raises(RuntimeError):
+        for lg in agent.bestball_leagues(state_file=state_file):
+            if lg['league_id'] != 5:
+                raise RuntimeError('job failed')
+    assert SyncState(state_file).high_water(9) is None
+    leagues = list(agent.bestball_leagues(state_file=state_file))
+    assert [lg['league_id'] for lg in leagues] == [6, 7]
+    assert SyncState(state_file).high_water(9) == '2019-08-30T10:00:00Z'
+
+
+def test_sync_state_prune(tmpdir):
+    state_file = str(tmpdir.join('sync.json'))
+    state = SyncState(state_file, grace_days=7)
+    leagues = [{'id': 1, 'draft_time': '2019-08-01T10:00:00.000Z'},
+               {'id': 2, 'draft_time': '2019-08-20T10:00:00.000Z'}]
+    for lg in leagues:
+        state.add(9, lg)
+    assert state.cutoff(9) is None
+    state.advance(9, leagues)
+    assert state.cutoff(9) == '2019-08-13T10:00:00'
+    state.save()
+    state = SyncState(state_file, grace_days=7)
+    assert list(state.clusters['9']['leagues']) == ['2']
+    assert not state.is_new(9, {'id': 1, 'draft_time': '2019-08-01T10:00:00.000Z'})
+    assert not state.is_new(9, {'id': 2, 'draft_time': '2019-08-20T10:00:00.000Z'})
+    assert state.is_new(9, {'id': 3, 'draft_time': '2019-08-14T10:00:00.000Z'})
+
+
+def draft_content(league_id, time_window_id=7, booking_ids=(101, 102), adp='1.5',
+                  projected_points='300.0', team_id=1, injury_status=None):
+    return {'draft': {
+        'id': league_id,
+        'time_window_id': time_window_id,
+        'teams': [{'id': 1, 'abbr': 'BUF', 'city': 'Buffalo', 'nickname': 'Bills'},
+                  {'id': 2, 'abbr': 'MIA', 'city': 'Miami', 'nickname': 'Dolphins'}],
+        'positions': [{'id': '1', 'name': 'QB'}, {'id': '2', 'name': 'RB'}],
+        'bookings': [{'id': b, 'player_id': b + 1000, 'adp': adp, 'position_id': 1,
+                      'projected_points': projected_points, 'status': 'active'}
+                     for b in booking_ids],
+        'players': [{'id': b + 1000, 'first_name': 'A', 'last_name': str(b),
+                     'team_id': team_id if b % 2 else None,
+                     'injury_status': injury_status}
+                    for b in booking_ids],
+        'draft_rosters': [{'user_id': 5, 'pick_order': 1, 'picks': [
+            {'id': 1, 'booking_id': booking_ids[0], 'draft_roster_id': 3,
+             'pick_number': 1, 'slot_id': 1, 'source': 'user', 'created_at': 'x'},
+            {'id': 2, 'booking_id': booking_ids[-1], 'draft_roster_id': 3,
+             'pick_number': 2, 'slot_id': 2, 'source': 'auto', 'created_at': 'x'}]}]
+    }}
+
+
+def test_draft_picks_pool_index():
+    parser = Parser()
+    picks = parser.draft_picks(draft_content(1))
+    assert picks[0] == {
+        'booking_id': 101, 'id': 1, 'draft_roster_id': 3, 'pick_number': 1,
+        'slot_id': 1, 'source': 'user', 'user_id': 5, 'league_id': 1,
+        'player_id': 1101, 'adp': '1.5', 'position_id': 1, 'projected_points': '300.0',
+        'first_name': 'A', 'last_name': '101', 'team_id': 1, 'injury_status': None,
+        'team_abbr': 'BUF', 'position': 'QB'}
+    assert picks[1]['team_abbr'] == 'FA'
+    index = parser.pool_index(draft_content(2)['draft'])
+    assert len(index) == 2 and 101 in index
+
+    # drafts from same time window share index, a new booking rebuilds it
+    drafts = [draft_content(2), draft_content(3, booking_ids=(101, 103))]
+    picks = parser.draft_picks_many(drafts)
+    assert [(p['league_id'], p['booking_id']) for p in picks] == \
+        [(2, 101), (2, 102), (3, 101), (3, 103)]
+    assert parser.pool_index({'time_window_id': 7}) is not index
+    assert 103 in parser.pool_index({'time_window_id': 7})
+
+
+def test_draft_picks_draft_values():
+    '''values that change between drafts come from each draft, not the shared index'''
+    drafts = [draft_content(1),
+              draft_content(2, adp='50.0', projected_points='10.0', team_id=2,
+                            injury_status='O')]
+    picks = Parser().draft_picks_many(drafts)
+    assert [(p['league_id'], p['adp'], p['projected_points']) for p in picks] == [
+        (1, '1.5', '300.0'), (1, '1.5', '300.0'),
+        (2, '50.0', '10.0'), (2, '50.0', '10.0')]
+    assert [(p['team_id'], p['team_abbr'], p['injury_status']) for p in picks] == [
+        (1, 'BUF', None), (None, 'FA', None), (2, 'MIA', 'O'), (None, 'FA', 'O')]
+    assert picks == [pk for d in drafts for pk in Parser().draft_picks(d)]
+    player = Parser().pool_index(drafts[0]['draft']).get(101)
+    assert not {'adp', 'team_id', 'team_abbr', 'injury_status'} & set(player)
+
+
+def test_draft_picks_columnar():
+    parser = Parser()
+    drafts = [draft_content(1), draft_content(2, booking_ids=(101, 103))]
+    picks = parser.draft_picks_many(drafts)
+    columns = Parser().draft_picks_many(drafts, columnar=True)
+    assert len(columns) == len(picks) == 4
+    assert list(columns['league_id']) == [p['league_id'] for p in picks]
+    assert list(columns['booking_id']) == [p['booking_id'] for p in picks]
+    assert list(columns['adp']) == [float(p['adp']) for p in picks]
+    assert columns.user_ids() == [5, 5, 5, 5]
+    assert columns.users == [5]
+    assert columns['user_id'].itemsize == 4
+
+
+def test_draft_picks_columnar_draft_values():
+    drafts = [draft_content(1), draft_content(2, adp='50.0', projected_points='10.0')]
+    columns = Parser().draft_picks_many(drafts, columnar=True)
+    assert list(columns['adp']) == [1.5, 1.5, 50.0, 50.0]
+    assert list(columns['projected_points']) == [300.0, 300.0, 10.0, 10.0]
+
+
+def test_draft_picks_dataframe():
+    pytest.importorskip('pandas')
+    df = Parser().draft_picks_many([draft_content(1)], columnar=True).to_dataframe()
+    assert list(df['pick_number']) == [1, 2]
+    assert df['user_id'].dtype == 'category'
+
+
+def test_draft_picks_stream(tmpdir):
+    content = draft_content(1)
+    content['draft']['users'] = [{'id': 5, 'username': 'a', 'email': 'x'}]
+    file_name = str(tmpdir.join('draft.json'))
+    with open(file_name, 'w') as outfile:
+        json.dump(content, outfile)
+    compact = Parser.compact(Scraper._json_file_stream(file_name, root='draft'))
+    assert compact['users'] == [{'id': 5, 'username': 'a'}]
+    assert 'status' not in compact['bookings'][0]
+    assert Parser().draft_picks(Scraper._json_file_stream(file_name, root='draft')) == \
+        Parser().draft_picks(content)
+    assert Parser().draft_users(compact) == Parser().draft_users(content)
+
+
+@pytest.mark.parametrize('cache', [None, False])
+def test_agent_draft_stream_cache(tmpdir, cache):
+    '''streamed drafts are not stored, so only stream without a cache'''
+    pytest.importorskip('requests')
+    kwargs = {} if cache is None else {'cache': cache}
+    agent = Agent(cache_name=str(tmpdir.join('draft.sqlite')), **kwargs)
+    content = draft_content(1)
+    content['draft']['users'] = [{'id': 5, 'username': 'a'}]
+    calls = []
+
+    def get_json(url, **kwargs):
+        calls.append('json')
+        return content
+
+    def get_json_stream(url, root=None, **kwargs):
+        calls.append('stream')
+        return iter_resource(io.BytesIO(json.dumps(content).encode()), root=root,
+                             stream=kwargs.get('stream'))
+
+    agent.s.get_json = get_json
+    agent.s.get_json_stream = get_json_stream
+    picks, users, user_league = agent.draft(1, stream=True)
+    assert calls == ['stream' if cache is False else 'json']
+    assert picks == Parser().draft_picks(content)
@@ -92,3 +92,34 @@ def test_salaries(scraper, parser, draft_group_id):
     assert isinstance(salaries, list)
     assert isinstance(salaries[0], dict)
 
+
+def test_salaries_stream(parser):
+    '''
+
+    Args:
+        parser:
+
+    Returns:
+
+    '''
+    lines = iter(['Position,Name,Salary\n', 'QB,A,7000\n', 'RB,B,6500\n'])
+    salaries = parser.salaries(lines)
+    assert len(salaries) == 2
+    assert salaries[0]['Name'] == 'A'
+    assert salaries == parser.salaries('Position,Name,Salary\nQB,A,7000\nRB,B,6500\n')
+
+
+@pytest.mark.parametrize('cache', [None, False])
+def test_agent_salaries_cache(tmpdir, cache):
+    pytest.importorskip('requests')
+    kwargs = {} if cache is None else {'cache': cache}
+    agent = Agent(cache_name=str(tmpdir.join('dk.sqlite')), **kwargs)
+    calls = []
+
+    def salaries(draft_group_id, stream=False):
+        calls.append(stream)
+        return 'Position,Name,Salary\nQB,A,7000\n'
+
+    agent.scraper.salaries = salaries
+    assert agent.salaries(1)[0]['Name'] == 'A'
+    assert calls == [cache is False]
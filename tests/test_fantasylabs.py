@@ -0,0 +1,17 @@
+# test_fantasylabs.py
+
+from sportscraper.fantasylabs import BScraper
+
+
+def test_model_cached(tmpdir):
+    '''Warm rerun in capture mode never launches browser'''
+    bs = BScraper(profile=None, capture=True,
+                  cache_name=str(tmpdir.join('fl.sqlite')))
+    model_url = ('https://www.fantasylabs.com/api/playermodel/2/'
+                 '1_1_2020/?modelId=1950741&projOnly=true')
+    bs._store(model_url, '{"PlayerModels": []}', 'application/json')
+    assert bs.model('nba', datestr='1_1_2020') == {'PlayerModels': []}
+    assert bs.provenance[-1] == (model_url, 'cache')
+    assert 'player-models' not in ' '.join(bs.urls)
+    assert bs._browser is None
+    bs.close()
@@ -0,0 +1,64 @@
+# test_imports.py
+# keeps heavy dependencies out of import time, scrapers import them when created
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+HEAVY_MODULES = [
+    'aiohttp',
+    'asyncio',
+    'ijson',
+    'numpy',
+    'pandas',
+    'psutil',
+    'pyarrow',
+    'pyvirtualdisplay',
+    'requests',
+    'requests_html',
+    'selenium',
+    'seleniumwire',
+]
+
+
+def import_module(module):
+    '''
+    Imports module in fresh interpreter
+
+    Args:
+        module(str): e.g. 'sportscraper.draft'
+
+    Returns:
+        tuple: (float seconds, list of loaded modules)
+
+    '''
+    code = (
+        'import json, sys, time; t = time.perf_counter(); import {}; '
+        'print(json.dumps([time.perf_counter() - t, sorted(sys.modules)]))'
+    ).format(module)
+    proc = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout)
+
+
+@pytest.mark.parametrize('module', [
+    'sportscraper',
+    'sportscraper.dates',
+    'sportscraper.draft',
+    'sportscraper.draftkings',
+    'sportscraper.fantasylabs',
+    'sportscraper.yahoo',
+])
+def test_no_heavy_imports(module):
+    _, modules = import_module(module)
+    loaded = [m for m in HEAVY_MODULES if m in modules]
+    assert not loaded
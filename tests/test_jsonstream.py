@@ -0,0 +1,58 @@
+# test_jsonstream.py
+
+import io
+import json
+
+import pytest
+
+from sportscraper import jsonstream
+from sportscraper.jsonstream import IterReader, iter_resource
+
+
+DOC = {'draft': {
+    'id': 7,
+    'time_window_id': 3,
+    'teams': [{'id': 1, 'abbr': 'BUF'}],
+    'bookings': [{'id': 1, 'adp': 1.5, 'tags': [{'a': [1, 2]}]},
+                 {'id': 2, 'adp': None}],
+    'draft_rosters': [],
+    'players': [1, 'x', None],
+    'meta': {'nested': {'bookings': [1]}},
+}}
+
+
+@pytest.fixture(params=['ijson', 'json'])
+def backend(request, monkeypatch):
+    if request.param == 'ijson':
+        pytest.importorskip('ijson')
+    else:
+        monkeypatch.setattr(jsonstream, 'backend', lambda: None)
+    yield request.param
+
+
+def test_iter_resource(backend):
+    data = json.dumps(DOC).encode('utf-8')
+    items = list(iter_resource(io.BytesIO(data), root='draft',
+                               stream=('bookings', 'draft_rosters', 'players')))
+    assert items == [
+        ('id', 7),
+        ('time_window_id', 3),
+        ('teams', [{'id': 1, 'abbr': 'BUF'}]),
+        ('bookings', {'id': 1, 'adp': 1.5, 'tags': [{'a': [1, 2]}]}),
+        ('bookings', {'id': 2, 'adp': None}),
+        ('players', 1),
+        ('players', 'x'),
+        ('players', None),
+        ('meta', {'nested': {'bookings': [1]}}),
+    ]
+    unwrapped = json.dumps(DOC['draft']).encode('utf-8')
+    assert list(iter_resource(io.BytesIO(unwrapped), root='draft',
+                              stream=('bookings', 'draft_rosters', 'players'))) == items
+    assert list(iter_resource(io.BytesIO(data))) == [('draft', DOC['draft'])]
+
+
+def test_iter_reader(backend):
+    data = json.dumps(DOC).encode('utf-8')
+    chunks = [data[i:i + 5] for i in range(0, len(data), 5)]
+    items = dict(iter_resource(IterReader(iter(chunks)), root='draft'))
+    assert items == DOC['draft']
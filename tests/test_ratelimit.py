@@ -0,0 +1,75 @@
+# test_ratelimit.py
+
+import pytest
+
+from sportscraper.ratelimit import (
+    RateLimiter, ThrottledAdapter, TokenBucket, shared_bucket)
+
+
+def test_token_bucket_burst():
+    bucket = TokenBucket(rate=1, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() > 0
+
+
+def test_token_bucket_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_shared_bucket():
+    assert shared_bucket('example.com', 1, 2) is shared_bucket('example.com', 1, 2)
+    assert shared_bucket('example.com', 1, 2) is not shared_bucket('example.org', 1, 2)
+
+
+def test_rate_limiter_hosts():
+    limiter = RateLimiter(rate=0.25, burst=1)
+    other = RateLimiter(rate=0.25, burst=1)
+    url = 'https://api.playdraft.com/v1/clustered_complete_contests'
+    assert limiter.bucket(url) is other.bucket(url)
+    assert limiter.bucket(url).rate == 0.5
+    assert limiter.bucket('https://www.google.com').rate == 0.25
+
+
+def test_rate_limiter_from_delay():
+    limiter = RateLimiter.from_delay(4)
+    assert limiter.rate == 0.25
+    assert limiter.bucket('https://api.playdraft.com/v1/users').rate == 0.25
+
+
+class Recorder:
+    '''Adapter and rate limiter that log calls in order'''
+
+    def __init__(self):
+        self.events = []
+
+    def wait(self, url):
+        self.events.append(('wait', url))
+
+    def send(self, request, **kwargs):
+        self.events.append(('send', request.url))
+        return request
+
+
+class Request:
+    url = 'https://api.playdraft.com/v1/users'
+
+
+def test_throttled_adapter():
+    recorder = Recorder()
+    adapter = ThrottledAdapter(recorder, recorder)
+    request = Request()
+    assert adapter.send(request, stream=True) is request
+    assert recorder.events == [('wait', request.url), ('send', request.url)]
+
+
+def test_scraper_rate_limiter():
+    pytest.importorskip('requests')
+    from sportscraper.scraper import RequestScraper
+    url = 'https://api.playdraft.com/v1/users'
+    scraper = RequestScraper(cache=False)
+    assert scraper.rate_limiter.bucket(url).rate == 0.5
+    assert isinstance(scraper.session.get_adapter(url), ThrottledAdapter)
+    assert RequestScraper(cache=False, delay=10).rate_limiter.bucket(url).rate == 0.1
+    scraper = RequestScraper(cache=False, delay=0)
+    assert not isinstance(scraper.session.get_adapter(url), ThrottledAdapter)
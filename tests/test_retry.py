@@ -0,0 +1,108 @@
+# test_retry.py
+
+import time
+
+import pytest
+
+from sportscraper.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    shared_breaker,
+)
+
+
+def test_parse_retry_after():
+    assert RetryPolicy.parse_retry_after('120') == 120
+    assert RetryPolicy.parse_retry_after(None) is None
+    assert RetryPolicy.parse_retry_after('soon') is None
+    assert RetryPolicy.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+
+
+def test_wait_time():
+    policy = RetryPolicy(backoff=1, max_backoff=5, max_retry_after=30)
+    assert 0.5 <= policy.wait_time(0) <= 1
+    assert 2.5 <= policy.wait_time(10) <= 5
+    assert policy.wait_time(0, '10') == 10
+    assert policy.wait_time(0, '3600') == 30
+
+
+def test_should_retry():
+    policy = RetryPolicy(retries=2)
+    assert policy.should_retry('GET', 0, 503)
+    assert policy.should_retry('GET', 1)
+    assert not policy.should_retry('GET', 2, 503)
+    assert not policy.should_retry('GET', 0, 404)
+    assert not policy.should_retry('POST', 0, 503)
+    assert not policy.should_retry('POST', 0, 429)
+    assert policy.should_retry('POST', 0, 429, retry_after='5')
+    assert policy.should_retry('POST', 0, 503, idempotent=True)
+
+
+class FlakyTransport:
+    '''Transport whose adapter answers 503 once, then 200'''
+
+    def __init__(self):
+        self.statuses = [503, 200]
+
+    def prefixes(self):
+        return ['https://']
+
+    def adapter(self, prefix):
+        return self
+
+    def mount(self, session, cache=None, rate_limiter=None):
+        from sportscraper.transport import Transport
+        return Transport.mount(self, session, cache, rate_limiter)
+
+    def send(self, request, **kwargs):
+        from requests.models import Response
+        resp = Response()
+        resp.status_code = self.statuses.pop(0)
+        resp.url = request.url
+        resp.raw = None
+        return resp
+
+    def close(self):
+        pass
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.waits = []
+
+    def wait(self, url):
+        self.waits.append(url)
+
+
+def test_retry_rate_limited():
+    '''every attempt, including retries, waits for the rate limiter'''
+    pytest.importorskip('requests')
+    from sportscraper.scraper import RequestScraper
+    limiter = CountingLimiter()
+    scraper = RequestScraper(cache=False, transport=FlakyTransport(),
+                             rate_limiter=limiter, retry=RetryPolicy(backoff=0.01))
+    url = 'https://retry.example.com/x'
+    assert scraper._request('GET', url).status_code == 200
+    assert limiter.waits == [url, url]
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker('a.com', failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    time.sleep(0.06)
+    assert breaker.state == 'half-open'
+    breaker.check()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+
+
+def test_shared_breaker():
+    assert shared_breaker('a.com') is shared_breaker('a.com')
@@ -1,9 +1,16 @@
 # test_scraper.py
 
+import asyncio
+import io
 import os
+import sys
+from types import SimpleNamespace
+
 import pytest
 
-from sportscraper.scraper import RequestScraper, BrowserScraper
+from sportscraper.scraper import (AsyncRequestScraper, RequestScraper,
+                                  BrowserScraper, WaybackScraper,
+                                  CHROME_BLOCK_PREFS, FIREFOX_BLOCK_PREFS)
 
 
 @pytest.yield_fixture(scope='session')
@@ -11,11 +18,15 @@ def scraper():
     scraper = RequestScraper(cache_name='test_rs')
     yield scraper
 
+@pytest.yield_fixture(scope='session')
+def ascraper():
+    ascraper = AsyncRequestScraper(concurrency=4, delay=0.5)
+    yield ascraper
+
 @pytest.yield_fixture(scope='session')
 def bscraper():
-    bscraper = BrowserScraper(profile=os.getenv('FIREFOX_PROFILE'))
-    yield bscraper
-    bscraper.__del__()
+    with BrowserScraper(profile=os.getenv('FIREFOX_PROFILE')) as bscraper:
+        yield bscraper
 
 def test_rget(scraper):
     '''
@@ -45,6 +56,78 @@ def test_rget_json(scraper):
     assert isinstance(content, dict)
     assert content.get('username') is not None
 
+def test_session():
+    '''
+
+    Returns:
+
+    '''
+    requests = pytest.importorskip('requests')
+    assert type(RequestScraper(cache=False).session) is requests.Session
+
+
+class StreamResponse:
+    provenance = 'network'
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_content(self, chunk_size):
+        return iter(self.chunks)
+
+
+def test_iter_decoded():
+    '''
+
+    Returns:
+
+    '''
+    pytest.importorskip('requests')
+    scraper = RequestScraper(cache=False)
+    chunks = [b'a,b\r', b'\nc,\xc3', b'\xa9\n', b'd']
+    lines = list(scraper._iter_decoded(StreamResponse(chunks), 'utf-8', True, 2))
+    assert lines == ['a,b\r\n', 'c,\u00e9\n', 'd']
+    chunks = list(scraper._iter_decoded(StreamResponse(chunks), 'utf-8', False, 2))
+    assert ''.join(chunks) == 'a,b\r\nc,\u00e9\nd'
+    assert scraper.stats['bytes'] == 22
+
+
+def test_provenance():
+    '''
+
+    Returns:
+
+    '''
+    resp = SimpleNamespace(status_code=200, from_cache=True, revalidated=False)
+    assert RequestScraper._provenance(resp) == 'cache'
+    resp.revalidated = True
+    assert RequestScraper._provenance(resp) == 'revalidated'
+    resp = SimpleNamespace(status_code=200)
+    assert RequestScraper._provenance(resp) == 'network'
+
+
+def test_cache_stats(scraper):
+    '''
+
+    Args:
+        scraper:
+
+    Returns:
+
+    '''
+    scraper.reset_stats()
+    url = 'https://api.bitbucket.org/2.0/users/karllhughes'
+    scraper.get_json(url)
+    stats = scraper.cache_stats()
+    assert stats['hits'] + stats['misses'] + stats['revalidations'] == 1
+    assert scraper.provenance[-1][1] in ('cache', 'revalidated', 'network')
+
 def test_bget(bscraper):
     '''
 
@@ -72,3 +155,228 @@ def test_bget_json(bscraper):
     content = bscraper.get_json(url)
     assert isinstance(content, dict)
     assert content.get('username') is not None
+
+def test_bclose_spares_siblings(bscraper):
+    '''Closing one browser leaves other browsers running'''
+    with BrowserScraper(profile=os.getenv('FIREFOX_PROFILE')) as other:
+        procs = other._process_tree()
+        assert procs
+    assert not any(proc.is_running() for proc in procs)
+    assert 'Google' in bscraper.get('https://www.google.com')
+
+def test_bcache(tmpdir):
+    '''Cached pages come back as str and dict without launching browser'''
+    bs = BrowserScraper(profile=None, cache_name=str(tmpdir.join('b.sqlite')))
+    bs._store('https://example.com/', '<html></html>', 'text/html; charset=utf-8')
+    bs._store('https://example.com/api', '{"a": 1}', 'application/json')
+    assert bs.get('https://example.com/') == '<html></html>'
+    assert bs.get_json('https://example.com/api') == {'a': 1}
+    assert bs.provenance[-1] == ('https://example.com/api', 'cache')
+    assert bs.pages == 0
+    assert bs._browser is None
+    bs.close()
+
+class FakeDriver:
+    '''Stands in for selenium webdriver after login'''
+
+    current_url = 'https://www.draftkings.com/lobby'
+
+    def execute_script(self, script):
+        return 'Mozilla/5.0 (X11; Linux x86_64; rv:68.0) Gecko/20100101 Firefox/68.0'
+
+    def get_cookies(self):
+        return [{'name': 'jwe', 'value': 'abc', 'domain': '.draftkings.com',
+                 'path': '/', 'secure': True, 'expiry': 2000000000}]
+
+    def quit(self):
+        pass
+
+def test_request_scraper(tmpdir):
+    pytest.importorskip('requests')
+    bs = BrowserScraper(profile=None, cache_name=str(tmpdir.join('b.sqlite')))
+    bs._browser = FakeDriver()
+    rs = bs.request_scraper()
+    assert rs.cache is bs.cache
+    assert 'Firefox/68.0' in rs.headers['User-Agent']
+    cookie = next(iter(rs.session.cookies))
+    assert (cookie.name, cookie.value, cookie.domain) == ('jwe', 'abc', '.draftkings.com')
+    bs.close()
+
+def test_bcaptured_json():
+    pytest.importorskip('seleniumwire')
+    url = 'https://api.bitbucket.org/2.0/users/karllhughes'
+    with BrowserScraper(profile=os.getenv('FIREFOX_PROFILE'), capture=True) as bs:
+        bs.get(url)
+        payloads = bs.captured_json('bitbucket.org/2.0/users')
+    assert payloads[url].get('username') is not None
+
+class StubOptions:
+    '''Records browser options'''
+
+    def __init__(self):
+        self.arguments = []
+        self.experimental = {}
+
+    def add_argument(self, arg):
+        self.arguments.append(arg)
+
+    def add_experimental_option(self, name, value):
+        self.experimental[name] = value
+
+
+class StubProfile:
+    '''Records firefox profile preferences'''
+
+    def __init__(self, profile):
+        self.prefs = {}
+
+    def set_preference(self, pref, value):
+        self.prefs[pref] = value
+
+
+@pytest.fixture
+def stub_webdriver(monkeypatch):
+    '''Stands in for selenium webdriver module'''
+    caps = SimpleNamespace(DesiredCapabilities=SimpleNamespace(FIREFOX={}))
+    for name in ('selenium', 'selenium.webdriver', 'selenium.webdriver.common'):
+        monkeypatch.setitem(sys.modules, name, SimpleNamespace())
+    monkeypatch.setitem(
+        sys.modules, 'selenium.webdriver.common.desired_capabilities', caps)
+    yield SimpleNamespace(
+        FirefoxOptions=StubOptions,
+        ChromeOptions=StubOptions,
+        FirefoxProfile=StubProfile,
+        Firefox=lambda **kwargs: kwargs,
+        Chrome=lambda **kwargs: kwargs,
+    )
+
+
+def test_bfirefox_options(stub_webdriver):
+    bs = BrowserScraper(profile=None, cache=False)
+    driver = bs._firefox(stub_webdriver)
+    assert driver['options'].arguments == ['-headless', '--width=1280', '--height=800']
+    prefs = driver['firefox_profile'].prefs
+    for resource in ('images', 'fonts', 'css'):
+        for pref, value in FIREFOX_BLOCK_PREFS[resource].items():
+            assert prefs[pref] == value
+    for kwargs in ({'visible': True}, {'xvfb': True}):
+        bs = BrowserScraper(profile=None, cache=False, block=(), **kwargs)
+        driver = bs._firefox(stub_webdriver)
+        assert driver['options'].arguments == []
+        assert driver['firefox_profile'].prefs == {}
+
+
+def test_bchrome_options(stub_webdriver):
+    bs = BrowserScraper(profile=None, cache=False, engine='chrome')
+    options = bs._chrome(stub_webdriver)['options']
+    assert '--headless' in options.arguments
+    prefs = options.experimental['prefs']
+    for resource in ('images', 'fonts', 'css'):
+        for pref, value in CHROME_BLOCK_PREFS[resource].items():
+            assert prefs[pref] == value
+    bs = BrowserScraper(profile=None, cache=False, engine='chrome', visible=True)
+    assert '--headless' not in bs._chrome(stub_webdriver)['options'].arguments
+
+
+def test_aget_json_many(ascraper):
+    '''
+
+    Args:
+        ascraper:
+
+    Returns:
+
+    '''
+    users = ['karllhughes', 'tutorials']
+    urls = ['https://api.bitbucket.org/2.0/users/{}'.format(u) for u in users]
+    content = ascraper.get_json_many(urls)
+    assert isinstance(content, list)
+    assert [c.get('username') for c in content] == users
+
+def test_async_cookie_jar():
+    '''cookies keep their domains, so auth cookies only go to their own host'''
+    pytest.importorskip('aiohttp')
+    from requests.cookies import create_cookie
+    from yarl import URL
+    ascraper = AsyncRequestScraper(cache=False)
+    ascraper.session.cookies.set_cookie(
+        create_cookie('jwe', 'secret', domain='.draftkings.com', secure=True))
+    ascraper.session.cookies.set_cookie(
+        create_cookie('host', 'only', domain='www.draftkings.com'))
+    ascraper.session.cookies.set_cookie(create_cookie('any', 'host', domain=''))
+
+    async def cookie_jar():
+        return ascraper._cookie_jar()
+
+    jar = asyncio.run(cookie_jar())
+
+    def sent(url):
+        return sorted(jar.filter_cookies(URL(url)))
+
+    assert sent('https://api.draftkings.com/draftgroups') == ['any', 'jwe']
+    assert sent('https://www.draftkings.com/lineup') == ['any', 'host', 'jwe']
+    assert sent('https://api.playdraft.com/v1/users') == ['any']
+    assert sent('http://api.draftkings.com/draftgroups') == ['any']
+
+
+def test_async_proxy():
+    pytest.importorskip('requests')
+    ascraper = AsyncRequestScraper(cache=False, proxies={'https': 'http://proxy:3128'})
+    assert ascraper._proxy('https://api.playdraft.com/v1/users') == 'http://proxy:3128'
+    assert ascraper._proxy('http://www.google.com') is None
+
+
+def test_get_filecache_expired(tmpdir):
+    '''body just downloaded is returned even if it expires at once'''
+    requests = pytest.importorskip('requests')
+    scraper = RequestScraper(cache=False, expire_hours=0, delay=0)
+
+    def request(method, url, **kwargs):
+        resp = requests.models.Response()
+        resp.status_code = 200
+        resp.url = url
+        resp.raw = io.BytesIO(b'caf\xc3\xa9')
+        return resp
+
+    scraper._request = request
+    url = 'https://a.com/x'
+    assert scraper.get_filecache(url, savedir=str(tmpdir)) == 'café'
+    with scraper.get_filecache(url, savedir=str(tmpdir), stream=True) as infile:
+        assert infile.read() == 'café'
+
+
+def test_wayback_closest():
+    snapshots = [{'timestamp': ts} for ts in
+                 ('20180901120000', '20180905080000', '20180910230000')]
+    closest = WaybackScraper.closest
+    assert closest(snapshots, '20180905')['timestamp'] == '20180905080000'
+    assert closest(snapshots, '20180903')['timestamp'] == '20180901120000'
+    assert closest(snapshots, '20180908')['timestamp'] == '20180910230000'
+    assert closest(snapshots, '20181001')['timestamp'] == '20180910230000'
+    assert closest(snapshots, '20181001', max_delta=3) is None
+    assert closest([], '20181001') is None
+
+class OfflineWayback(WaybackScraper):
+    '''Serves a fixed index and counts snapshot fetches'''
+
+    def cdx(self, url, start=None, end=None):
+        return [
+            {'timestamp': '20180901120000', 'original': url, 'digest': 'A'},
+            {'timestamp': '20180902120000', 'original': url, 'digest': 'A'},
+            {'timestamp': '20180905120000', 'original': url, 'digest': 'B'},
+        ]
+
+    def get_many(self, urls, params=None, encoding='utf-8', return_exceptions=False):
+        self.fetched = list(urls)
+        return [''.join(['page ', u]) for u in urls]
+
+def test_wayback_many_dedupe(tmpdir):
+    pytest.importorskip('requests')
+    s = OfflineWayback(cache_name=str(tmpdir.join('w.sqlite')))
+    dates = ['2018-09-01', '2018-09-02', '2018-09-03', '2018-09-05', '2018-09-20']
+    pages = s.get_wayback_many('http://example.com/', dates, max_delta=2)
+    assert len(s.fetched) == 2
+    assert pages['2018-09-01'][0] is pages['2018-09-03'][0]
+    assert pages['2018-09-02'][1] == '20180902'
+    assert pages['2018-09-05'][0] != pages['2018-09-01'][0]
+    assert pages['2018-09-20'] == (None, None)
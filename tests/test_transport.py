@@ -0,0 +1,52 @@
+# test_transport.py
+
+import pytest
+
+from sportscraper.transport import HTTP2Adapter, Transport, shared_transport
+
+
+def test_shared_transport():
+    assert shared_transport() is shared_transport()
+    assert shared_transport(pool_maxsize=20) is not shared_transport()
+
+
+def test_adapter_reuse():
+    pytest.importorskip('requests')
+    transport = Transport(pool_maxsize=4, host_pool_sizes={'a.com': 12})
+    assert transport.adapter('https://') is transport.adapter('https://')
+    assert transport.adapter('https://a.com')._pool_maxsize == 12
+    assert transport.adapter('https://b.com')._pool_maxsize == 4
+
+
+def test_mount():
+    requests = pytest.importorskip('requests')
+    transport = Transport()
+    s1 = transport.mount(requests.Session())
+    s2 = transport.mount(requests.Session())
+    url = 'https://api.playdraft.com/v1/clustered_complete_contests'
+    assert s1.get_adapter(url) is s2.get_adapter(url)
+    assert s1.get_adapter(url) is not s1.get_adapter('https://www.google.com')
+
+
+def test_mount_empty_cache(tmpdir):
+    requests = pytest.importorskip('requests')
+    from sportscraper.cache import CacheAdapter, ResponseCache
+    cache = ResponseCache(str(tmpdir.join('http.sqlite')))
+    assert len(cache) == 0
+    s = Transport().mount(requests.Session(), cache)
+    assert isinstance(s.get_adapter('https://www.google.com'), CacheAdapter)
+
+
+def test_http2_adapter():
+    requests = pytest.importorskip('requests')
+    httpx = pytest.importorskip('httpx')
+
+    def handler(request):
+        return httpx.Response(200, json={'url': str(request.url)})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    session = requests.Session()
+    session.mount('https://', HTTP2Adapter(client=client))
+    resp = session.get('https://a.com/x', params={'b': 1})
+    assert resp.status_code == 200
+    assert resp.json() == {'url': 'https://a.com/x?b=1'}